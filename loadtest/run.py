@@ -0,0 +1,212 @@
+"""จำลองผู้ใช้ N คนเปิดแอปพร้อมกัน ล็อกอิน แล้ววนกดครบทุกเมนู สรุปเวลา render (p50/p95/p99) และจำนวน request ที่ยิงไปต้นทาง
+
+    python -m loadtest.run --sessions 20 --rounds 3
+
+สคริปต์จะเปิดเซิร์ฟเวอร์จำลอง (loadtest.stub_server) และ `streamlit run app.py` ตัวจริงให้เอง
+แต่ละ session คุยกับ Streamlit ผ่าน websocket แบบเดียวกับเบราว์เซอร์ (ส่ง BackMsg / อ่าน ForwardMsg)
+เวลาที่วัดคือตั้งแต่ส่งคำสั่ง rerun จนสคริปต์รันจบ (script_finished)
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+import websockets
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from loadtest import stub_server
+from loadtest.synthetic_data import LOADTEST_PASSWORD, TEAM, generate
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+FINISHED_SUCCESSFULLY = ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY
+PROBLEM_ALERT_FORMATS = {Alert.ERROR, Alert.WARNING}
+# กล่อง st.error / st.warning ที่เป็นเนื้อหาปกติของหน้า ไม่ใช่ error (ป้ายสถานะงานของแต่ละคนในหน้า Team Profile)
+EXPECTED_ALERTS = ("**สถานะ:**",)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return float("nan")
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = int(rank), min(int(rank) + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def fetch_stats(stub_url):
+    with urllib.request.urlopen(f"{stub_url}/__stats", timeout=10) as response:
+        return json.load(response)
+
+
+class BrowserSession:
+    """เบราว์เซอร์จำลอง 1 แท็บ: จำ widget ที่เห็นในรอบล่าสุด แล้วส่งค่าที่ต้องการกลับไปตอนสั่ง rerun"""
+
+    def __init__(self, app_url, timeout):
+        self._url = app_url.replace("http", "ws", 1).rstrip("/") + "/_stcore/stream"
+        self._timeout = timeout
+        self._ws = None
+        self._storage_id = None  # component ที่อ่าน token จาก LocalStorage - ตอบกลับว่าเบราว์เซอร์นี้ไม่มีค่าที่จำไว้
+        self.widgets = {}        # label -> (ชนิด element, proto ของ element)
+
+    async def __aenter__(self):
+        self._ws = await websockets.connect(self._url, subprotocols=["streamlit"], max_size=None)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._ws.close()
+
+    async def _send_rerun(self, states):
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        if self._storage_id is not None:
+            states = [(self._storage_id, "json_value", "{}")] + list(states)
+        for widget_id, field, value in states:
+            widget = msg.rerun_script.widget_states.widgets.add()
+            widget.id = widget_id
+            setattr(widget, field, value)
+        await self._ws.send(msg.SerializeToString())
+
+    async def rerun(self, states=()):
+        """สั่ง rerun แล้วรอจนสคริปต์รันจบจริง (ข้ามรอบที่ถูก st.rerun ตัดกลางคัน)
+        คืน (วินาที, ข้อความ error) - นับทั้ง exception และกล่อง st.error / st.warning (หน้าที่จับ error แล้วโชว์กล่องแดง
+        ก็ถือว่า render ไม่สำเร็จ) ยกเว้นกล่องที่เป็นส่วนหนึ่งของหน้าตามปกติ (EXPECTED_ALERTS)"""
+        started = time.perf_counter()
+        await self._send_rerun(states)
+        self.widgets = {}
+        exceptions = []
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await asyncio.wait_for(self._ws.recv(), self._timeout))
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                element_kind = element.WhichOneof("type")
+                proto = getattr(element, element_kind)
+                if element_kind == "exception":
+                    exceptions.append(proto.message)
+                elif (element_kind == "alert" and proto.format in PROBLEM_ALERT_FORMATS
+                      and not any(marker in proto.body for marker in EXPECTED_ALERTS)):
+                    exceptions.append(proto.body)
+                elif element_kind == "component_instance" and proto.id.endswith("auth_token") and self._storage_id is None:
+                    self._storage_id = proto.id
+                    await self._send_rerun([])
+                elif getattr(proto, "label", None):
+                    self.widgets[proto.label] = (element_kind, proto)
+            elif kind == "script_finished" and msg.script_finished == FINISHED_SUCCESSFULLY:
+                return time.perf_counter() - started, exceptions
+
+    def widget_id(self, label):
+        return self.widgets[label][1].id
+
+
+async def run_session(index, app_url, rounds, timeout, samples):
+    """ผู้ใช้ 1 คน: เปิดแอป -> ล็อกอิน -> กดทุกเมนูวน rounds รอบ (เก็บผลลง samples[เมนู])"""
+    username = TEAM[index % len(TEAM)]
+    async with BrowserSession(app_url, timeout) as browser:
+        samples["(เปิดแอป)"].append(await browser.rerun())
+        samples["(ล็อกอิน)"].append(await browser.rerun([
+            (browser.widget_id("👤 Username"), "string_value", username),
+            (browser.widget_id("🔑 Password"), "string_value", LOADTEST_PASSWORD),
+            (browser.widget_id("เข้าสู่ระบบ"), "trigger_value", True),
+        ]))
+        menu_label = next(label for label, (kind, _) in browser.widgets.items() if kind == "radio")
+        menus = list(browser.widgets[menu_label][1].options)
+        for _ in range(rounds):
+            for menu in menus:
+                samples[menu].append(await browser.rerun([(browser.widget_id(menu_label), "string_value", menu)]))
+
+
+async def run_all(args, app_url):
+    samples = defaultdict(list)
+    await asyncio.gather(*(run_session(i, app_url, args.rounds, args.timeout, samples) for i in range(args.sessions)))
+    return samples
+
+
+def start_streamlit(stub_url, port, workdir):
+    """เปิด `streamlit run app.py` ชี้ secrets ไปที่เซิร์ฟเวอร์จำลอง แล้วรอจนพร้อม"""
+    os.makedirs(os.path.join(workdir, ".streamlit"), exist_ok=True)
+    secrets = {
+        "SHEET_URL": f"{stub_url}/spreadsheets/d/LOADTEST/edit",
+        "GAS_URL": f"{stub_url}/gas",
+        "LINE_PUSH_URL": f"{stub_url}/line/push",
+        "LINE_CHANNEL_TOKEN": "loadtest",
+        "LINE_GROUP_ID": "loadtest",
+        "OUTBOX_PATH": os.path.join(workdir, "gas_outbox.sqlite3"),
+    }
+    with open(os.path.join(workdir, ".streamlit", "secrets.toml"), "w", encoding="utf-8") as f:
+        f.writelines(f"{key} = {json.dumps(value)}\n" for key, value in secrets.items())
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(120):
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError("เปิด streamlit ไม่ขึ้นภายใน 60 วินาที")
+
+
+def report(args, samples, elapsed, before, after):
+    everything = [seconds * 1000 for values in samples.values() for seconds, _ in values]
+    print(f"\n{args.sessions} sessions x {args.rounds} รอบ ใช้เวลา {elapsed:.1f} วินาที ({len(everything)} renders)\n")
+    print(f"{'เมนู':<45} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    rows = [(menu, [s * 1000 for s, _ in values], sum(bool(e) for _, e in values)) for menu, values in samples.items()]
+    rows.append(("ทั้งหมด", everything, sum(r[2] for r in rows)))
+    for menu, values, n_errors in rows:
+        print(f"{menu[:45]:<45} {len(values):>5} {percentile(values, 50):>9.0f} {percentile(values, 95):>9.0f} "
+              f"{percentile(values, 99):>9.0f} {n_errors:>7}")
+    first_errors = {e[0] for values in samples.values() for _, e in values if e}
+    for message in sorted(first_errors)[:5]:
+        print(f"  ! {message[:200]}")
+
+    print("\nrequest ที่ยิงไปต้นทางระหว่างทดสอบ:")
+    for key in sorted(after["counts"]):
+        delta = after["counts"][key] - before["counts"].get(key, 0)
+        if delta:
+            print(f"  {key:<40} {delta:>6}")
+    sent = sum(after["bytes_out"].values()) - sum(before["bytes_out"].values())
+    print(f"  {'(ข้อมูล CSV ที่ส่งออก)':<40} {sent / 1024:>6.0f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="จำนวนผู้ใช้พร้อมกัน")
+    parser.add_argument("--rounds", type=int, default=2, help="แต่ละคนกดครบทุกเมนูกี่รอบ")
+    parser.add_argument("--stub-port", type=int, default=8765)
+    parser.add_argument("--app-port", type=int, default=8599)
+    parser.add_argument("--timeout", type=float, default=120, help="เวลาสูงสุดต่อการ render 1 ครั้ง (วินาที)")
+    stub_server.add_data_arguments(parser)
+    args = parser.parse_args()
+
+    sheets = generate(sites=args.sites, tasks=args.tasks, tool_log=args.tool_log, seed=args.seed)
+    stub, _ = stub_server.start(sheets, port=args.stub_port, latency=args.latency_ms / 1000, fail_rate=args.fail_rate)
+    stub_url = f"http://127.0.0.1:{args.stub_port}"
+    with tempfile.TemporaryDirectory() as workdir:
+        app = start_streamlit(stub_url, args.app_port, workdir)
+        try:
+            before = fetch_stats(stub_url)
+            started = time.perf_counter()
+            samples = asyncio.run(run_all(args, f"http://127.0.0.1:{args.app_port}"))
+            elapsed = time.perf_counter() - started
+            after = fetch_stats(stub_url)
+        finally:
+            app.terminate()
+            app.wait()
+            stub.shutdown()
+    report(args, samples, elapsed, before, after)
+
+
+if __name__ == "__main__":
+    main()
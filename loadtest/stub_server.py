@@ -0,0 +1,277 @@
+"""เซิร์ฟเวอร์จำลอง Google Sheets (gviz CSV) + Apps Script (GAS_URL) + LINE push สำหรับทดสอบในเครื่อง
+
+    python -m loadtest.stub_server --port 8765 --tasks 20000
+
+แล้วตั้ง secrets ของแอปเป็น
+    SHEET_URL = "http://127.0.0.1:8765/spreadsheets/d/LOADTEST/edit"
+    GAS_URL = "http://127.0.0.1:8765/gas"
+    LINE_PUSH_URL = "http://127.0.0.1:8765/line/push"
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from loadtest.synthetic_data import generate
+
+# ภาษา query ของ gviz เฉพาะส่วนที่แอปใช้: select */คอลัมน์, where (=, !=, contains, is null, and/or, วงเล็บ), limit, offset
+_TOKEN = re.compile(r"\s*(?:(?P<str>'[^']*'|\"[^\"]*\")|(?P<num>\d+)|(?P<op>!=|<>|=|\(|\)|,|\*)|(?P<word>[A-Za-z]+))")
+
+
+def _tokenize(query):
+    tokens, pos = [], 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None:
+            raise ValueError(f"gviz query ไม่รองรับ: {query[pos:]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        tokens.append((kind, value[1:-1] if kind == "str" else value))
+        pos = match.end()
+    return tokens
+
+
+def _column_index(letters):
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def run_query(rows, query):
+    """รัน gviz query บนข้อมูล (แถวแรกคือหัวคอลัมน์) คืนแถวผลลัพธ์พร้อมหัวคอลัมน์"""
+    header, body = rows[0], rows[1:]
+    tokens = _tokenize(query) if query else []
+    pos = 0
+
+    def peek(value=None):
+        if pos < len(tokens) and (value is None or tokens[pos][1].lower() == value):
+            return tokens[pos]
+        return None
+
+    def take(value=None):
+        nonlocal pos
+        token = peek(value)
+        if token is None:
+            raise ValueError(f"gviz query ผิดรูปแบบใกล้ {tokens[pos:]!r}")
+        pos += 1
+        return token
+
+    selected = list(range(len(header)))
+    if peek("select"):
+        take("select")
+        if peek("*"):
+            take("*")
+        else:
+            selected = [_column_index(take()[1])]
+            while peek(","):
+                take(",")
+                selected.append(_column_index(take()[1]))
+
+    def condition():
+        if peek("("):
+            take("(")
+            result = disjunction()
+            take(")")
+            return result
+        column = _column_index(take()[1])
+        if peek("is"):
+            take("is")
+            take("null")
+            return lambda row: row[column] == ""
+        op = take()[1].lower()
+        literal = take()[1]
+        if op == "=":
+            return lambda row: row[column] == literal
+        if op in ("!=", "<>"):
+            return lambda row: row[column] != literal and row[column] != ""
+        if op == "contains":
+            return lambda row: literal in row[column]
+        raise ValueError(f"ไม่รองรับตัวดำเนินการ {op}")
+
+    def conjunction():
+        parts = [condition()]
+        while peek("and"):
+            take("and")
+            parts.append(condition())
+        return lambda row: all(part(row) for part in parts)
+
+    def disjunction():
+        parts = [conjunction()]
+        while peek("or"):
+            take("or")
+            parts.append(conjunction())
+        return lambda row: any(part(row) for part in parts)
+
+    if peek("where"):
+        take("where")
+        predicate = disjunction()
+        body = [row for row in body if predicate(row)]
+    limit = offset = None
+    while peek("limit") or peek("offset"):
+        keyword = take()[1].lower()
+        value = int(take()[1])
+        if keyword == "limit":
+            limit = value
+        else:
+            offset = value
+    if offset:
+        body = body[offset:]
+    if limit is not None:
+        body = body[:limit]
+    return [[row[i] for i in selected] for row in [header] + body]
+
+
+class StubState:
+    """ข้อมูลทุกชีต + ตัวนับ request (อ่านได้ที่ GET /__stats)"""
+
+    def __init__(self, sheets, latency=0.0, fail_rate=0.0):
+        self.sheets = sheets
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.applied = {}  # requestId -> ผลที่ตอบไปครั้งแรก (ส่งซ้ำได้คำตอบเดิม ไม่เขียนซ้ำ)
+        self.counts = Counter()
+        self.bytes_out = Counter()
+
+    def snapshot(self):
+        with self.lock:
+            return {"counts": dict(self.counts), "bytes_out": dict(self.bytes_out),
+                    "rows": {name: len(rows) - 1 for name, rows in self.sheets.items()}}
+
+    def apply_write(self, body):
+        """เขียนตามคำสั่ง แล้วคืน response แบบที่ GAS ตอบ (คำสั่งต่อท้ายบอกเลขแถวสุดท้ายที่เขียน แถว 1 = หัวคอลัมน์)"""
+        with self.lock:
+            request_id = body.get("requestId")
+            if request_id is not None and request_id in self.applied:
+                self.counts["gas:duplicate"] += 1
+                return self.applied[request_id]
+            result = {"status": "success"}
+            action = body.get("action", "append")
+            self.counts[f"gas:{action}"] += 1
+            rows = self.sheets.setdefault(body["sheet"], [[]])
+            if action == "append_rows":
+                rows.extend([[str(v) for v in row] for row in body["rows"]])
+                result["row"] = len(rows)
+            elif action == "update_pm_status":
+                site_col, status_col = rows[0].index("ชื่อไซต์งาน"), rows[0].index("สถานะ PM")
+                for row in rows[1:]:
+                    if row[site_col] == body["siteName"]:
+                        row[status_col] = body["status"]
+            elif action == "append":
+                rows.append([str(v) for v in body["data"]])
+                result["row"] = len(rows)
+            else:
+                raise ValueError(f"ไม่รู้จัก action {action}")
+            # จำ requestId หลังเขียนสำเร็จเท่านั้น (คำสั่งที่ error ต้องส่งใหม่แล้วเขียนได้ ไม่ใช่ถูกนับว่าซ้ำ)
+            if request_id is not None:
+                self.applied[request_id] = result
+            return result
+
+
+def make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, body, content_type="application/json"):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _maybe_fail(self):
+            if state.latency:
+                time.sleep(state.latency)
+            if state.fail_rate and random.random() < state.fail_rate:
+                self._send(503, b'{"status": "error"}')
+                return True
+            return False
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            if url.path == "/__stats":
+                return self._send(200, json.dumps(state.snapshot(), ensure_ascii=False).encode())
+            if not url.path.endswith("/gviz/tq"):
+                return self._send(404, b"{}")
+            params = urllib.parse.parse_qs(url.query)
+            name = params.get("sheet", [""])[0]
+            query = params.get("tq", [""])[0]
+            with state.lock:
+                state.counts[f"gviz:{name}{'?' if query else ''}"] += 1
+                rows = [list(row) for row in state.sheets.get(name, [])]
+            if self._maybe_fail():
+                return
+            if not rows:
+                return self._send(404, b"sheet not found", "text/plain")
+            try:
+                rows = run_query(rows, query)
+            except (ValueError, IndexError) as e:
+                return self._send(400, str(e).encode(), "text/plain")
+            buffer = io.StringIO()
+            csv.writer(buffer, quoting=csv.QUOTE_ALL, lineterminator="\n").writerows(rows)
+            body = buffer.getvalue().encode()
+            with state.lock:
+                state.bytes_out[name] += len(body)
+            self._send(200, body, "text/csv; charset=utf-8")
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.startswith("/line"):
+                with state.lock:
+                    state.counts["line:push"] += 1
+                return self._send(200, b"{}")
+            if self._maybe_fail():
+                return
+            try:
+                result = state.apply_write(body)
+            except (KeyError, ValueError) as e:
+                return self._send(200, json.dumps({"status": "error", "message": str(e)}, ensure_ascii=False).encode())
+            self._send(200, json.dumps(result).encode())
+
+    return Handler
+
+
+def start(sheets=None, host="127.0.0.1", port=8765, latency=0.0, fail_rate=0.0):
+    """เปิดเซิร์ฟเวอร์ใน thread เบื้องหลัง คืน (server, state) - ปิดด้วย server.shutdown()"""
+    state = StubState(sheets if sheets is not None else generate(), latency, fail_rate)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, name="loadtest-stub", daemon=True).start()
+    return server, state
+
+
+def add_data_arguments(parser):
+    parser.add_argument("--sites", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--tool-log", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0, help="หน่วงทุก request จำลองความช้าของ Google")
+    parser.add_argument("--fail-rate", type=float, default=0, help="สัดส่วน request ที่ตอบ 503 (0-1)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_data_arguments(parser)
+    args = parser.parse_args()
+    sheets = generate(sites=args.sites, tasks=args.tasks, tool_log=args.tool_log, seed=args.seed)
+    server, _ = start(sheets, args.host, args.port, args.latency_ms / 1000, args.fail_rate)
+    print(f"stub server: http://{args.host}:{args.port} (Ctrl+C เพื่อปิด)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
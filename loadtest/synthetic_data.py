@@ -0,0 +1,83 @@
+"""สร้างข้อมูลจำลองของทุกชีตที่ app.py ใช้ (หัวคอลัมน์เหมือนของจริง) ปรับขนาดได้ตามต้องการ"""
+import datetime
+import random
+
+TEAM = ["Heart", "Phubeth", "Mink", "Film", "Folk", "Chan"]
+TASK_STATUSES = ["Planning", "In progress", "Problem", "Complete"]
+TASK_TYPES = ["งานด่วน", "งานตามแพลน", "ติดตั้งใหม่", "ตรวจเช็ค"]
+TOOL_STATUSES = ["ยืมอุปกรณ์ (Borrow)", "คืนอุปกรณ์ (Return)"]
+THAI_MONTHS = ["ม.ค.", "ก.พ.", "มี.ค.", "เม.ย.", "พ.ค.", "มิ.ย.", "ก.ค.", "ส.ค.", "ก.ย.", "ต.ค.", "พ.ย.", "ธ.ค."]
+LOADTEST_PASSWORD = "loadtest"  # รหัสผ่านของผู้ใช้จำลองทุกคน
+
+
+def generate(sites=200, tasks=5000, tool_log=5000, equipment=40, users=30, quiz=30, seed=0):
+    """คืน dict ชื่อชีต -> list ของแถว (แถวแรกคือหัวคอลัมน์) ค่าทุกช่องเป็น str เหมือน CSV จาก gviz"""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    be_year = (today.year + 543) % 100
+    site_names = [f"Site {i:04d}" for i in range(1, sites + 1)]
+    tool_names = [f"Tool {i:03d}" for i in range(1, equipment + 1)]
+
+    def thai_month():
+        return f"{rng.choice(THAI_MONTHS)} {be_year}"
+
+    def timestamp(days_back):
+        moment = datetime.datetime.combine(today, datetime.time(8)) - datetime.timedelta(days=days_back, minutes=rng.randrange(600))
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+    data = {}
+    data["Master_Site"] = [["ชื่อไซต์งาน (Process Work)", "ละติจูด (Latitude)", "ลองจิจูด (Longitude)"]] + [
+        [name, f"{rng.uniform(6, 20):.5f}", f"{rng.uniform(98, 105):.5f}"] for name in site_names
+    ]
+    data["PM_Plan"] = [["ชื่อไซต์งาน", "PM ใหญ่", "PM ย่อย ครั้งที่ 1", "PM ย่อย ครั้งที่ 2", "PM ย่อย ครั้งที่ 3",
+                        "สถานะ PM", "วันที่ซิมหมดอายุ", "หมายเหตุ"]] + [
+        [name, thai_month(), thai_month(), thai_month(), rng.choice([thai_month(), "-"]),
+         rng.choice(["", "", "PM แล้ว"]), f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{today.year + 1}",
+         rng.choice(["", "", "ตรวจสายสัญญาณ"])]
+        for name in site_names
+    ]
+    data["Asset_Sensor"] = [["ชื่อไซต์งาน", "Sensor", "Serial"]] + [
+        [rng.choice(site_names), rng.choice(["Temp", "Humidity", "Flow", "Pressure"]), f"SN{i:06d}"]
+        for i in range(sites * 3)
+    ]
+    data["Task & Workload"] = [["Timestamp", "ชื่อไซต์งาน", "ชื่องาน / รายละเอียด", "ประเภทงาน", "วันที่เข้าทำ (Scheduled Date)",
+                                "กำหนดเสร็จ (Deadline)", "สถานะงาน", "ผู้รับผิดชอบหลัก", "ผู้ช่วย"]]
+    for i in range(tasks):
+        start = today - datetime.timedelta(days=tasks - i)
+        lead = rng.choice(TEAM)
+        helpers = rng.sample([m for m in TEAM if m != lead], rng.randint(0, 2))
+        data["Task & Workload"].append([
+            timestamp(tasks - i), rng.choice(site_names), f"งานหมายเลข {i}", rng.choice(TASK_TYPES),
+            start.strftime("%d/%m/%Y"), (start + datetime.timedelta(days=rng.randint(1, 14))).strftime("%d/%m/%Y"),
+            rng.choice(TASK_STATUSES), lead, ", ".join(helpers),
+        ])
+    data["Master_Equipment"] = [["Equipment", "Volume"]] + [[name, str(rng.randint(1, 10))] for name in tool_names]
+    data["Team_Tools"] = [["Timestamp", "Name", "Tool", "Site", "Status", "จำนวน"]] + [
+        [timestamp(tool_log - i), rng.choice(TEAM), rng.choice(tool_names), rng.choice(site_names),
+         rng.choice(TOOL_STATUSES), "1"]
+        for i in range(tool_log)
+    ]
+    data["Users_DB"] = [["Username", "Password", "Status", "Role"]] + [
+        [TEAM[i] if i < len(TEAM) else f"user{i:03d}", LOADTEST_PASSWORD, "Approved", "admin" if i == 0 else "member"]
+        for i in range(users)
+    ]
+    data["Team_Profile"] = [["ชื่อ", "ตำแหน่ง", "ความเชี่ยวชาญ", "เบอร์ติดต่อ", "ใบเซอร์"]] + [
+        [name, "Technician", "Sensor", "080-000-0000", "-"] for name in TEAM
+    ]
+    data["Learning_Content"] = [["หมวดหมู่", "ชื่อหัวข้อ", "สูตรการคำนวณ", "ข้อมูลการคำนวณ", "ตัวอย่างการคำนวณ"]] + [
+        ["ไฟฟ้า", f"หัวข้อ {i}", "V = I x R", "-", "-"] for i in range(20)
+    ]
+    data["Quiz_Data"] = [["คำถาม", "ตัวเลือก A", "ตัวเลือก B", "ตัวเลือก C", "ตัวเลือก D", "เฉลย", "คำอธิบาย (ถ้าตอบผิด)"]] + [
+        [f"{i} + {i} = ?", str(2 * i), str(2 * i + 1), str(i), str(i * i + 3), str(2 * i), "บวกเลขธรรมดา"] for i in range(quiz)
+    ]
+    data["Quiz_Scores"] = [["เวลา", "ชื่อ", "ชุดข้อสอบ", "คะแนน", "คะแนนเต็ม", "ข้อที่ผิด"]] + [
+        [f"2024-01-{1 + i % 28:02d} 09:00:00", TEAM[i % len(TEAM)], "Q00000000", str(i % (quiz + 1)), str(quiz), ""]
+        for i in range(3 * len(TEAM))
+    ]
+    data["Calc_Tools"] = [["ชื่อสูตร", "ชื่อตัวแปร", "สมการ", "หน่วยผลลัพธ์", "คำอธิบาย"],
+                          ["กำลังไฟฟ้า", "V, I", "V x I", "W", "P = V x I"],
+                          ["พื้นที่วงกลม", "r", "3.14159 * r ** 2", "m²", "πr²"]]
+    data["Manual_Docs"] = [["หมวดหมู่", "รายละเอียด", "ลิงก์เอกสาร"]] + [
+        ["Wiring", f"คู่มือ {i}", f"https://example.com/doc/{i}"] for i in range(10)
+    ]
+    return data
@@ -0,0 +1 @@
+"""โค้ดส่วนกลางของ Sensor Team System (app.py เป็นแค่ตัวเปิดหน้าเว็บ + เมนู)"""
@@ -0,0 +1,205 @@
+"""🔐 ตรวจรหัสผ่าน (Users_DB) และ session ที่ล็อกอินค้างไว้"""
+import hashlib
+import hmac
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+from sensorapp.data import get_sheet_hub
+
+
+def check_password_strength(password):
+    """ตรวจสอบว่ารหัสผ่านแข็งแกร่งพอไหม"""
+    errors = []
+    
+    if len(password) < 8:
+        errors.append("❌ ความยาวต้องมีอย่างน้อย 8 ตัวอักษร")
+    if not re.search(r'[A-Za-z]', password):
+        errors.append("❌ ต้องมีตัวอักษรภาษาอังกฤษอย่างน้อย 1 ตัว")
+    if not re.search(r'[0-9]', password):
+        errors.append("❌ ต้องมีตัวเลขอย่างน้อย 1 ตัว")
+    if not re.search(r'[!@#$%^&*(),.?":{}|<>_\-+=/\\]', password):
+        errors.append("❌ ต้องมีอักขระพิเศษ เช่น !@#$% อย่างน้อย 1 ตัว")
+    
+    return errors
+
+
+AUTH_HASH_ITERATIONS = 20_000  # รอบของ PBKDF2 (ต่อผู้ใช้ 1 คน ทำตอนคนนั้นล็อกอินครั้งแรกของแต่ละเวอร์ชันของ Users_DB)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class UserCredential:
+    salt: bytes
+    password_hash: bytes
+    status: str
+    role: str
+
+
+def _hash_password(password, salt):
+    return hashlib.pbkdf2_hmac("sha256", password.strip().encode(), salt, AUTH_HASH_ITERATIONS)
+
+
+class AuthIndex:
+    """ดัชนีผู้ใช้ของ Users_DB 1 เวอร์ชัน: username -> แถวในชีต
+    hash รหัสผ่านของแต่ละคนตอนที่คนนั้นล็อกอินครั้งแรก (ไม่ใช่ทุกคนพร้อมกันตอนชีตเปลี่ยน) แล้วจำไว้ใช้ครั้งต่อไป"""
+
+    def __init__(self, df_users):
+        self._df = df_users.reindex(columns=["Username", "Password", "Status", "Role"])
+        self._lock = threading.Lock()
+        self._credentials = {}  # username -> tuple ของ UserCredential (1 ตัวต่อแถว)
+        self._rows = {}
+        usernames = self._df["Username"]
+        for label, username in usernames[usernames.notna() & self._df["Password"].notna()].items():
+            self._rows.setdefault(str(username).strip(), []).append(label)
+        duplicates = sorted(name for name, labels in self._rows.items() if len(labels) > 1)
+        if duplicates:
+            # ใช้แถวแรกที่รหัสผ่านตรง (แบบเดียวกับตอนค้นจากตารางตรงๆ) แต่ควรให้ผู้ดูแลไปแก้ชีต
+            logger.warning("Users_DB มี Username ซ้ำกัน: %s", ", ".join(duplicates))
+
+    def credentials(self, username):
+        """UserCredential ของทุกแถวที่ชื่อนี้ (ไม่มีชื่อนี้ = tuple ว่าง) hash ครั้งแรกที่ถูกถาม"""
+        labels = self._rows.get(username)
+        if not labels:
+            return ()
+        with self._lock:
+            cached = self._credentials.get(username)
+            if cached is None:
+                cached = self._credentials[username] = tuple(self._credential(label) for label in labels)
+        return cached
+
+    def _credential(self, label):
+        _, password, status, role = self._df.loc[label]
+        salt = os.urandom(16)
+        return UserCredential(
+            salt=salt,
+            password_hash=_hash_password(str(password), salt),
+            status="" if pd.isna(status) else str(status).strip(),
+            role="user" if pd.isna(role) else str(role).strip(),
+        )
+
+
+@st.cache_resource(max_entries=2)
+def build_auth_index(users_version, _df_users):
+    """AuthIndex ของ Users_DB สร้างครั้งเดียวต่อเวอร์ชัน (แค่จัดกลุ่มแถวตามชื่อ ยังไม่ hash อะไร)
+    อยู่ส่วนกลางของ process ตารางรหัสผ่านไม่หลุดออกไปอยู่ใน DataFrame ของแต่ละ session"""
+    return AuthIndex(_df_users)
+
+
+_DUMMY_CREDENTIAL = UserCredential(salt=b"\0" * 16, password_hash=b"", status="", role="")
+
+
+def authenticate(username, password):
+    """คืน UserCredential ถ้า username/password ถูกต้อง ไม่งั้นคืน None
+    อ่าน snapshot จากคลังกลางโดยตรง (ไม่ผ่าน load_sheet) จึงไม่มีการคัดลอกตารางรหัสผ่านมาไว้ในหน้าเว็บ"""
+    snapshot = get_sheet_hub().get("Users_DB")
+    if 'Username' not in snapshot.df.columns or 'Password' not in snapshot.df.columns:
+        raise LookupError("ไม่พบคอลัมน์ 'Username' หรือ 'Password' ใน Google Sheets")
+    credentials = build_auth_index(snapshot.version, snapshot.df).credentials(username.strip())
+    # ไม่เจอชื่อผู้ใช้ก็ยังคำนวณ hash เหมือนกัน เวลาตอบกลับจะได้ไม่บอกใบ้ว่ามีชื่อนี้ในระบบหรือไม่
+    for credential in credentials or (_DUMMY_CREDENTIAL,):
+        candidate = _hash_password(password, credential.salt)
+        if credential is not _DUMMY_CREDENTIAL and hmac.compare_digest(candidate, credential.password_hash):
+            return credential
+    return None
+
+
+# =========================================================
+# 🔐 ระบบตรวจสอบการ Login (จำรหัสด้วย Local Storage)
+# =========================================================
+SESSION_TTL = 12 * 60 * 60  # วินาที - ล็อกอินค้างไว้ได้นานสุด 1 กะ
+
+
+class SessionStore:
+    """เก็บ session ที่ล็อกอินแล้วไว้ฝั่งเซิร์ฟเวอร์ (ใช้ร่วมกันทั้ง process)
+    token ที่ส่งให้เบราว์เซอร์คือ "<session id>.<HMAC>" - ปลอมไม่ได้ และลบทิ้งจากส่วนกลางได้ทันทีตอน logout"""
+
+    def __init__(self, secret, ttl):
+        self._secret = secret
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._sessions = {}  # session id -> (username, role, expires_at)
+
+    def _sign(self, session_id):
+        return hmac.new(self._secret, session_id.encode(), hashlib.sha256).hexdigest()
+
+    def issue(self, username, role):
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            # ล้าง session ที่หมดอายุไปแล้วทุกครั้งที่มีคนล็อกอินใหม่ (ไม่งั้นคนที่ไม่เคยกดออกจะค้างอยู่ตลอดไป)
+            expired = [sid for sid, (_, _, expires_at) in self._sessions.items() if expires_at < now]
+            for sid in expired:
+                del self._sessions[sid]
+            self._sessions[session_id] = (username, role, now + self._ttl)
+        return f"{session_id}.{self._sign(session_id)}"
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def verify(self, token):
+        """คืน (username, role) ถ้า token ถูกต้องและยังไม่หมดอายุ ไม่งั้นคืน None"""
+        session_id, _, signature = str(token or "").partition(".")
+        # เทียบเป็น bytes: compare_digest กับ str ที่มีอักขระนอก ASCII (token ปลอม/เพี้ยน) จะ TypeError แทนที่จะคืน False
+        if not session_id or not hmac.compare_digest(signature.encode(), self._sign(session_id).encode()):
+            return None
+        now = time.time()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session[2] < now:
+                self._sessions.pop(session_id, None)
+                return None
+        return session[:2]
+
+    def revoke(self, token):
+        session_id = str(token or "").partition(".")[0]
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+
+@st.cache_resource
+def get_session_store():
+    # ตั้ง SESSION_SECRET ใน secrets ได้ ถ้าไม่ตั้งจะสุ่มใหม่ทุกครั้งที่เปิดเซิร์ฟเวอร์ (ทุกคนต้องล็อกอินใหม่หลังรีสตาร์ต)
+    secret = st.secrets.get("SESSION_SECRET")
+    return SessionStore(secret.encode() if secret else os.urandom(32), SESSION_TTL)
+
+
+def _local_storage(method, key, **kwargs):
+    # เรียก component ของ streamlit_local_storage ตรงๆ: LocalStorage() วนรอในลูปจนกว่าเบราว์เซอร์จะตอบกลับ (หน้าค้าง)
+    # import ตรงนี้: session ที่ล็อกอินอยู่แล้วไม่ต้องโหลด component นี้เลย
+    from streamlit_local_storage import _st_local_storage
+    return _st_local_storage(method=method, key=key, **kwargs)
+
+
+def stored_session_token():
+    """token ที่เบราว์เซอร์จำไว้ใน LocalStorage (เบราว์เซอร์ยังไม่ตอบกลับ = None)
+    ไม่รอคำตอบ: หน้า Login ขึ้นได้ทันที พอเบราว์เซอร์ส่งค่ากลับมา Streamlit จะ rerun เองแล้วค่อยล็อกอินจาก token"""
+    items = _local_storage("getAll", "auth_token", default=None)
+    return (items or {}).get("auth")
+
+
+def remember_session_token(token):
+    _local_storage("setItem", "auth_remember", itemKey="auth", itemValue=token)
+
+
+def forget_session_token():
+    _local_storage("deleteAll", "auth_forget")
+
+
+def sign_in(username, role, token=None):
+    token = token or get_session_store().issue(username, role)
+    st.session_state['logged_in'] = True
+    st.session_state['username'] = username
+    st.session_state['role'] = role
+    st.session_state['session_token'] = token
+    # token อยู่ใน session_state กับ LocalStorage เท่านั้น ห้ามใส่ใน URL (ลิงก์ที่แชร์ต่อ/ประวัติเบราว์เซอร์จะพาล็อกอินเป็นคนนี้ได้)
+    return token
@@ -0,0 +1,232 @@
+"""🧮 การคำนวณที่ cache ตาม version ของข้อมูล (PM, สต๊อกอุปกรณ์, ภาระงาน, ดัชนีรายไซต์)"""
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# 🧮 --- การคำนวณที่ cache ตาม version ของข้อมูล --- 🧮
+# พารามิเตอร์ที่ขึ้นต้นด้วย _ Streamlit จะไม่เอาไป hash -> key ของ cache คือ version ของชีต
+# ข้อมูลเหมือนเดิม = version เดิม = ไม่ต้องคำนวณซ้ำ ถึงจะมีคนเปิดหน้าทิ้งไว้และ rerun ทั้งวันก็ตาม
+THAI_MONTHS = ["ม.ค.", "ก.พ.", "มี.ค.", "เม.ย.", "พ.ค.", "มิ.ย.", "ก.ค.", "ส.ค.", "ก.ย.", "ต.ค.", "พ.ย.", "ธ.ค."]
+PM_COLS = ['PM ใหญ่', 'PM ย่อย ครั้งที่ 1', 'PM ย่อย ครั้งที่ 2', 'PM ย่อย ครั้งที่ 3']
+
+
+THAI_MONTHS_FULL = ["มกราคม", "กุมภาพันธ์", "มีนาคม", "เมษายน", "พฤษภาคม", "มิถุนายน",
+                    "กรกฎาคม", "สิงหาคม", "กันยายน", "ตุลาคม", "พฤศจิกายน", "ธันวาคม"]
+THAI_MONTH_INDEX = {name: i + 1 for names in (THAI_MONTHS, THAI_MONTHS_FULL) for i, name in enumerate(names)}
+# "ม.ค.", "ม.ค. 68", "ม.ค. 2568", "มกราคม 2025" -> (เดือน, ปี)
+THAI_MONTH_PATTERN = "^(" + "|".join(re.escape(m) for m in sorted(THAI_MONTH_INDEX, key=len, reverse=True)) + r")\s*(\d{2,4})?"
+
+# ลำดับความสำคัญของสถานะ PM (เลขน้อย = ด่วนกว่า) -> (ข้อความสถานะ, สีหมุดบนแผนที่)
+PM_BUCKETS = {
+    1: ("🔴 ผ่านมาแล้ว (เลยกำหนด)", "red"),
+    2: ("🟠 เดือนนี้ (ต้องเข้าทำ)", "orange"),
+    3: ("🟡 เดือนหน้า (เตรียมตัว)", "beige"),
+    4: ("🟢 PM เรียบร้อยแล้ว / ยังไม่ถึงรอบ", "green"),
+}
+
+
+def parse_thai_month_periods(series, cur_year, cur_month):
+    """แปลงข้อความเดือน/ปีภาษาไทยทั้งคอลัมน์เป็นเลขงวดเดือน (ปี ค.ศ. * 12 + เดือน - 1), อ่านไม่ออก = NaN
+    ปีรองรับ พ.ศ. 2 หลัก (68), พ.ศ. 4 หลัก (2568) และ ค.ศ. (2025)
+    ถ้าไม่ระบุปี ถือเป็นเดือนในปีปัจจุบันเหมือนเดิม ยกเว้นรอยต่อปี (ธ.ค. -> "ม.ค." คือเดือนหน้า, ม.ค. -> "ธ.ค." คือเดือนที่แล้ว)
+    เดือนที่ผ่านไปนานแล้วจึงยังเป็น "เลยกำหนด" (ต.ค. -> "มี.ค." ไม่ใช่ มี.ค. ปีหน้า)"""
+    parts = series.astype("string").str.strip().str.extract(THAI_MONTH_PATTERN)
+    month = parts[0].map(THAI_MONTH_INDEX).astype(float)
+    year = pd.to_numeric(parts[1], errors="coerce")
+    year = year.where(~(year < 100), year + 2500)   # 68 -> 2568
+    year = year.where(~(year >= 2400), year - 543)  # พ.ศ. -> ค.ศ.
+    periods = (year * 12 + month - 1).to_numpy(dtype=float)
+
+    month = month.to_numpy(dtype=float)
+    this_year = cur_year * 12 + month - 1
+    if cur_month == 12:
+        this_year = np.where(month == 1, this_year + 12, this_year)
+    elif cur_month == 1:
+        this_year = np.where(month == 12, this_year - 12, this_year)
+    return np.where(year.isna().to_numpy(), this_year, periods)
+
+
+@st.cache_data(max_entries=16)
+def build_pm_schedule(_df_pm, pm_version, cur_year, cur_month):
+    """จัดสถานะ PM ของทุกไซต์แบบ vectorized: ดูทุกรอบ PM แล้วเลือกรอบที่ด่วนที่สุด
+    คืน DataFrame: ชื่อไซต์งาน, สถานะ, กำหนดการ, สี (ใช้ร่วมกันทั้งหน้า Dashboard และ Site Detail)"""
+    n = len(_df_pm)
+    cur_period = cur_year * 12 + cur_month - 1
+    cols = [c for c in PM_COLS if c in _df_pm.columns]
+
+    if cols:
+        periods = np.column_stack([parse_thai_month_periods(_df_pm[c], cur_year, cur_month) for c in cols])
+        raw_dates = np.column_stack([_df_pm[c].fillna("").astype(str).to_numpy() for c in cols])
+    else:
+        periods = np.full((n, 1), np.nan)
+        raw_dates = np.full((n, 1), "", dtype=object)
+
+    # NaN เทียบอะไรก็เป็น False -> รอบที่อ่านวันไม่ออกตกเป็นกลุ่ม 4 เอง
+    scores = np.full(periods.shape, 4)
+    scores[periods == cur_period + 1] = 3
+    scores[periods == cur_period] = 2
+    scores[periods < cur_period] = 1
+    best = scores.min(axis=1)
+    first_match = (scores == best[:, None]).argmax(axis=1)
+    due_date = np.where(best < 4, raw_dates[np.arange(n), first_match], "-")
+
+    pm_done = _df_pm['สถานะ PM'].fillna("").str.contains("PM แล้ว", regex=False).to_numpy() if 'สถานะ PM' in _df_pm.columns else np.zeros(n, dtype=bool)
+    best = np.where(pm_done, 4, best)
+    due_date = np.where(pm_done, "Completed", due_date)
+
+    labels = np.array([PM_BUCKETS[b][0] for b in sorted(PM_BUCKETS)], dtype=object)
+    colors = np.array([PM_BUCKETS[b][1] for b in sorted(PM_BUCKETS)], dtype=object)
+    return pd.DataFrame({
+        "ชื่อไซต์งาน": _df_pm['ชื่อไซต์งาน'].astype(str).to_numpy(),
+        "สถานะ": labels[best - 1],
+        "กำหนดการ": due_date,
+        "สี": colors[best - 1],
+    })
+
+
+class InventoryLedger:
+    """ยอดถือครองอุปกรณ์สะสมจาก Team_Tools (append-only): รอบถัดไปนับเฉพาะแถวใหม่ที่ต่อท้ายเข้ามา
+    ถ้าประวัติเก่าถูกแก้/ลบแม้แต่แถวเดียว (ลายนิ้วมือของทุกแถวที่เคยนับไม่ตรงเดิม) จะคำนวณใหม่ทั้งหมดด้วย groupby รอบเดียว"""
+
+    KEYS = ["ผู้เบิก/คืน", "อุปกรณ์"]
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._rows_seen = 0
+        self._fingerprint = None
+        empty_index = pd.MultiIndex.from_tuples([], names=self.KEYS)
+        self._held = pd.Series(dtype=float, index=empty_index)       # (ผู้เบิก, อุปกรณ์) -> จำนวนที่ยังไม่คืน
+        self._last_site = pd.Series(dtype=object, index=empty_index)  # (ผู้เบิก, อุปกรณ์) -> ไซต์ที่ยืมไปใช้ล่าสุด
+
+    @staticmethod
+    def _fingerprint_of(df):
+        """hash ของทุกแถว (ค่าทุกช่อง ไม่รวม index) รวมเป็นก้อนเดียว - vectorized ไม่ต้องวนทีละแถว"""
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+        return hashlib.sha1(row_hashes.tobytes()).hexdigest()
+
+    def update(self, df_tools):
+        with self._lock:
+            n = len(df_tools)
+            if n < self._rows_seen or (self._rows_seen and
+                                        self._fingerprint_of(df_tools.iloc[:self._rows_seen]) != self._fingerprint):
+                self._reset()
+            new_rows = df_tools.iloc[self._rows_seen:]
+            if not new_rows.empty and all(c in new_rows.columns for c in self.KEYS + ["สถานะ"]):
+                status = new_rows["สถานะ"].fillna("")
+                qty = new_rows["จำนวน"].fillna(1.0) if "จำนวน" in new_rows.columns else pd.Series(1.0, index=new_rows.index)
+                is_borrow = status.str.contains("ยืม|Borrow")
+                is_return = ~is_borrow & status.str.contains("คืน|Return")
+                signed = qty.where(is_borrow, 0.0) - qty.where(is_return, 0.0)
+
+                keyed = new_rows[self.KEYS].assign(qty=signed)
+                self._held = self._held.add(keyed.groupby(self.KEYS)["qty"].sum(), fill_value=0)
+                borrows = new_rows[is_borrow].dropna(subset=["ไซต์งาน"]) if "ไซต์งาน" in new_rows.columns else new_rows.iloc[0:0]
+                if not borrows.empty:
+                    latest = borrows.groupby(self.KEYS)["ไซต์งาน"].last()
+                    self._last_site = latest.combine_first(self._last_site)
+            self._rows_seen = n
+            self._fingerprint = self._fingerprint_of(df_tools) if n else None
+            return self._held.copy(), self._last_site.copy()
+
+
+@st.cache_resource
+def get_inventory_ledger():
+    return InventoryLedger()
+
+
+@st.cache_data(max_entries=16)
+def compute_inventory(_df_equip, _df_tools, equip_version, tools_version):
+    """คืน (ตารางสต๊อก: อุปกรณ์/ทั้งหมด/ถูกยืม/คงเหลือ, ตารางผู้ถือ: ผู้ถือ/อุปกรณ์/จำนวน/ไซต์ล่าสุด)"""
+    held, last_site = get_inventory_ledger().update(_df_tools)
+
+    if 'Equipment' in _df_equip.columns and 'Volume' in _df_equip.columns:
+        equip = _df_equip.dropna(subset=['Equipment', 'Volume']).drop_duplicates('Equipment', keep='last')
+        total = equip.set_index('Equipment')['Volume'].astype(int)
+    else:
+        total = pd.Series(dtype=int)
+
+    # นับเฉพาะอุปกรณ์ที่อยู่ในคลังหลัก (Master_Equipment) เหมือนเดิม
+    borrowed = held.groupby(level="อุปกรณ์").sum() if not held.empty else pd.Series(dtype=float)
+    borrowed = borrowed.reindex(total.index, fill_value=0.0)
+    df_stock = pd.DataFrame({
+        "อุปกรณ์": total.index,
+        "ทั้งหมด": total.to_numpy(),
+        "ถูกยืม": borrowed.to_numpy(),
+        "คงเหลือ": (total - borrowed).clip(lower=0).astype(int).to_numpy(),  # ป้องกันติดลบ
+    })
+
+    holders = held[held > 0]
+    df_holdings = pd.DataFrame({
+        "ผู้ถือ": holders.index.get_level_values(0) if not holders.empty else [],
+        "อุปกรณ์": holders.index.get_level_values(1) if not holders.empty else [],
+        "จำนวน": holders.to_numpy(),
+        "ไซต์ล่าสุด": last_site.reindex(holders.index).to_numpy() if not holders.empty else [],
+    })
+    return df_stock, df_holdings
+
+
+@dataclass(frozen=True)
+class Workload:
+    """ภาระงานของทั้งทีมจากชีตงาน 1 version (ใช้ร่วมกันทุก session ห้ามแก้ค่าข้างใน)
+    assignments: 1 แถวต่อ (งาน, คน) - task คือ index ของแถวในชีต, role คือ "lead" (ผู้รับผิดชอบหลัก) / "assistant" (ผู้ช่วย)"""
+    assignments: pd.DataFrame
+    counts: pd.DataFrame       # จำนวนงานแยกตาม person / role / status / site
+    total_active: int          # งานที่ยังไม่ Complete (นับงานละ 1 ไม่ว่ามีกี่คน)
+    active_by_role: dict       # role -> {ชื่อ: จำนวนงานที่ยังไม่ Complete} เรียงจากมากไปน้อย
+    tasks_by_person: dict      # ชื่อ -> index ของแถวงานที่คนนี้เป็นหลักหรือผู้ช่วย (เรียงตามลำดับในชีต)
+
+    def active_by_person(self, role="lead"):
+        return self.active_by_role.get(role, {})
+
+    def task_ids(self, person):
+        """แถวงานของคนนี้ (ชื่อต้องตรงทั้งคำ - "Film" ไม่ไปโดนงานของ "Filmy")"""
+        return self.tasks_by_person.get(person, [])
+
+
+@st.cache_resource(max_entries=4)
+def build_workload(tasks_version, _df_tasks):
+    """แตกคอลัมน์ผู้ช่วย ("A, B") เป็นคู่ คน<->งาน แล้วนับทุกแบบในรอบเดียว - สร้างครั้งเดียวต่อ version ของชีตงาน
+    ใช้ร่วมกันทั้ง Dashboard, Team Manager, Team Profile และ My Workload"""
+    df = _df_tasks
+    status = df['สถานะงาน'] if 'สถานะงาน' in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+    site = df['ชื่อไซต์งาน'] if 'ชื่อไซต์งาน' in df.columns else pd.Series(pd.NA, index=df.index, dtype="string")
+    active = ~status.eq('Complete').fillna(False) if 'สถานะงาน' in df.columns else pd.Series(False, index=df.index)
+
+    parts = []
+    if 'ผู้รับผิดชอบหลัก' in df.columns:
+        parts.append(pd.DataFrame({"task": df.index, "person": df['ผู้รับผิดชอบหลัก'].astype("string"), "role": "lead"}))
+    if 'ผู้ช่วย' in df.columns:
+        helpers = df['ผู้ช่วย'].astype("string").str.split(",").explode()
+        parts.append(pd.DataFrame({"task": helpers.index, "person": helpers.to_numpy(), "role": "assistant"}))
+    assignments = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=["task", "person", "role"])
+    assignments["person"] = assignments["person"].astype("string").str.strip()
+    assignments = assignments[assignments["person"].fillna("") != ""].drop_duplicates(["task", "person", "role"])
+    assignments = assignments.assign(
+        status=status.reindex(assignments["task"]).to_numpy(),
+        site=site.reindex(assignments["task"]).to_numpy(),
+        active=active.reindex(assignments["task"]).to_numpy(dtype=bool),
+    ).reset_index(drop=True)
+
+    counts = (assignments.groupby(["person", "role", "status", "site"], dropna=False, sort=False)
+              .size().rename("จำนวน").reset_index())
+    active_rows = assignments[assignments["active"]]
+    active_by_role = {role: rows["person"].value_counts().to_dict() for role, rows in active_rows.groupby("role")}
+    tasks_by_person = {person: sorted(rows.unique().tolist()) for person, rows in assignments.groupby("person")["task"]}
+    return Workload(assignments, counts, int(active.sum()), active_by_role, tasks_by_person)
+
+
+@st.cache_resource(max_entries=32)
+def group_rows_by_site(sheet_name, version, _df, site_col='ชื่อไซต์งาน'):
+    """ดัชนี ชื่อไซต์ -> แถวของไซต์นั้น (DataFrame) สร้างครั้งเดียวต่อ version ของชีต เปลี่ยนไซต์ก็แค่เปิด dict
+    ใช้ร่วมกันทุก session ห้ามแก้ค่าใน DataFrame ที่ได้กลับไป - คืน None ถ้าชีตไม่มีคอลัมน์ไซต์"""
+    if site_col not in _df.columns:
+        return None
+    return {site: rows for site, rows in _df.groupby(site_col, sort=False)}
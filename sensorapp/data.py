@@ -0,0 +1,874 @@
+"""📥 ชั้นข้อมูล: ดึงชีตจาก Google (snapshot + รีเฟรชเบื้องหลัง) และคิวเขียนข้อมูลลง GAS"""
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+import requests
+import streamlit as st
+
+from sensorapp.metrics import Metrics, get_metrics
+
+
+@st.cache_resource
+def get_http_session():
+    """HTTP session กลางของทั้ง process: ใช้ connection ซ้ำ (keep-alive) แทนการเปิดใหม่ทุกครั้งที่ยิง GAS / LINE / Google"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# กุญแจเชื่อมต่อ GSheet
+GAS_URL = st.secrets["GAS_URL"]
+SHEET_URL = st.secrets["SHEET_URL"]
+
+
+# 🌟 --- ฟังก์ชันส่วนกลาง --- 🌟
+class SheetFetcher:
+    """ดึงข้อมูลจาก Google แบบ single-flight: 1 ชีตมี request วิ่งออกไปได้ทีละ 1 ตัว คนที่มาพร้อมกันรอผลเดียวกัน"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}          # key -> {"done": Event, "result": ..., "error": ...}
+        self.fetches = Counter()     # จำนวนครั้งที่ยิงไปหา Google จริง
+        self.coalesced = Counter()   # จำนวนครั้งที่รอผลจากคนอื่นแทนการยิงซ้ำ
+        self.errors = Counter()
+
+    def fetch(self, key, loader, stats_key=None):
+        # stats_key: ชื่อที่ใช้นับสถิติ (ถ้า key มีรายละเอียดที่เปลี่ยนทุกรอบ เช่น offset จะได้ไม่แตกเป็นหลายแถว)
+        stats_key = stats_key or key
+        with self._lock:
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = {"done": threading.Event(), "result": None, "error": None}
+                self._inflight[key] = flight
+                self.fetches[stats_key] += 1
+            else:
+                self.coalesced[stats_key] += 1
+
+        if not is_leader:
+            # มีคนกำลังโหลดชีตนี้อยู่แล้ว -> รอแล้วใช้ DataFrame ก้อนเดียวกัน
+            flight["done"].wait()
+            if flight["error"] is not None:
+                raise flight["error"]
+            return flight["result"]
+
+        try:
+            flight["result"] = loader()
+        except Exception as e:
+            flight["error"] = e
+            with self._lock:
+                self.errors[stats_key] += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight["done"].set()
+        return flight["result"]
+
+    def stats(self):
+        with self._lock:
+            keys = set(self.fetches) | set(self.coalesced) | set(self.errors)
+            return {
+                k: {"fetches": self.fetches[k], "coalesced": self.coalesced[k], "errors": self.errors[k]}
+                for k in sorted(keys)
+            }
+
+
+@st.cache_resource
+def get_sheet_fetcher():
+    # ใช้ร่วมกันทั้ง process (ทุก session เห็นตัวเดียวกัน)
+    return SheetFetcher()
+
+
+def _download_sheet(sheet_name, query=None):
+    """ดาวน์โหลด CSV ดิบ (bytes) ของชีต - ยังไม่ parse เพื่อเอาไปทำ hash เทียบกับรอบก่อนได้
+    query: คำสั่ง Google Visualization Query (เช่น "select * offset 120") ให้ Google กรองมาให้ก่อนส่ง"""
+    sheet_id = SHEET_URL.split("/d/")[1].split("/")[0]
+    origin = "{0.scheme}://{0.netloc}".format(urllib.parse.urlsplit(SHEET_URL))  # ปกติคือ https://docs.google.com
+    encoded_sheet_name = urllib.parse.quote(sheet_name)
+    csv_url = f"{origin}/spreadsheets/d/{sheet_id}/gviz/tq?tqx=out:csv&sheet={encoded_sheet_name}&t={int(time.time())}"
+    if query:
+        csv_url += f"&headers=1&tq={urllib.parse.quote(query)}"
+    metrics = get_metrics()
+    kind = "query" if query else "full"
+    try:
+        with metrics.timer("sheet_fetch_seconds", sheet=sheet_name, kind=kind):
+            response = get_http_session().get(csv_url, timeout=30)
+            response.raise_for_status()
+    except requests.RequestException:
+        metrics.inc("sheet_fetch_errors_total", sheet=sheet_name, kind=kind)
+        raise
+    metrics.inc("sheet_fetch_bytes_total", len(response.content), sheet=sheet_name, kind=kind)
+    return response.content
+
+
+def _parse_sheet_csv(sheet_name, content):
+    df = pd.read_csv(
+        io.BytesIO(content), 
+        dtype=str,              # บังคับทุก Column เป็น String
+        keep_default_na=False,  # 👈 ห้าม Pandas แปลงค่าเป็น NaN เอง
+        na_values=['']          # 👈 ถือว่า NaN ก็แค่เซลล์ว่างเท่านั้น
+    )
+    return normalize_sheet(sheet_name, df)
+
+
+# 📐 --- Schema ของแต่ละชีต --- 📐
+# columns : ชื่อคอลัมน์มาตรฐาน -> ชนิดข้อมูล ("str", "float", "int", หรือ ("datetime", format))
+# aliases : ชื่อหัวคอลัมน์อื่นที่เคยใช้ใน GSheet -> ชื่อมาตรฐาน
+# detect  : ชื่อมาตรฐาน -> คำที่ต้องมีในหัวคอลัมน์ (ใช้กับชีตที่ตั้งชื่อหัวไม่ตายตัว)
+# positions: ลำดับคอลัมน์ -> ชื่อมาตรฐาน (ชีตที่ GAS appendRow ตามตำแหน่ง และหัวคอลัมน์ไม่แน่นอน)
+# คอลัมน์ที่ไม่ได้ระบุจะถูกตัดช่องว่างหัวท้ายและเก็บเป็น str เหมือนเดิม
+SHEET_SCHEMAS = {
+    "PM_Plan": {
+        "columns": {"ชื่อไซต์งาน": "str", "สถานะ PM": "str", "PM ใหญ่": "str", "PM ย่อย ครั้งที่ 1": "str",
+                    "PM ย่อย ครั้งที่ 2": "str", "PM ย่อย ครั้งที่ 3": "str", "วันที่ซิมหมดอายุ": "str", "หมายเหตุ": "str"},
+    },
+    "Master_Site": {
+        "columns": {"ชื่อไซต์งาน (Process Work)": "str", "ละติจูด (Latitude)": "float", "ลองจิจูด (Longitude)": "float"},
+    },
+    "Asset_Sensor": {
+        "detect": {"ชื่อไซต์งาน": ("ไซต์", "Site")},
+    },
+    "Task & Workload": {
+        # คอลัมน์แรกคือเวลาที่บันทึก (หน้า My Workload ส่งเป็นช่องแรกของแถว) ใช้เรียง "งานล่าสุดขึ้นก่อน" ในหน้า Team Manager
+        "positions": {0: "Timestamp"},
+        "columns": {"Timestamp": ("datetime", "%Y-%m-%d %H:%M:%S"), "ชื่อไซต์งาน": "str", "ชื่องาน / รายละเอียด": "str", "ประเภทงาน": "str", "สถานะงาน": "str",
+                    "วันที่เข้าทำ (Scheduled Date)": ("datetime", "%d/%m/%Y"), "กำหนดเสร็จ (Deadline)": ("datetime", "%d/%m/%Y"),
+                    "ผู้รับผิดชอบหลัก": "str", "ผู้ช่วย": "str"},
+    },
+    "Master_Equipment": {
+        "columns": {"Equipment": "str", "Volume": "int"},
+    },
+    "Team_Tools": {
+        # GAS บันทึกเป็น [เวลา, ผู้เบิก, อุปกรณ์, ไซต์, สถานะ, จำนวน]
+        "positions": {0: "วันที่บันทึก", 1: "ผู้เบิก/คืน", 2: "อุปกรณ์", 3: "ไซต์งาน", 4: "สถานะ"},
+        "columns": {"วันที่บันทึก": ("datetime", "%Y-%m-%d %H:%M:%S"), "จำนวน": "float"},
+    },
+    "Users_DB": {
+        "columns": {"Username": "str", "Password": "str", "Status": "str", "Role": "str"},
+    },
+    "Manual_Docs": {
+        "aliases": {"ลิงก์เอกสาร": "ลิงก์โฟลเดอร์"},
+    },
+    "Quiz_Scores": {
+        # GAS บันทึกเป็น [เวลา, ชื่อ, ชุดข้อสอบ, คะแนน, คะแนนเต็ม, ข้อที่ผิด] (ดู sensorapp/quiz.py)
+        "positions": {0: "เวลา", 1: "ชื่อ", 2: "ชุดข้อสอบ", 3: "คะแนน", 4: "คะแนนเต็ม", 5: "ข้อที่ผิด"},
+        "columns": {"เวลา": ("datetime", "%Y-%m-%d %H:%M:%S"), "ชื่อ": "str", "ชุดข้อสอบ": "str",
+                    "คะแนน": "float", "คะแนนเต็ม": "float", "ข้อที่ผิด": "str"},
+    },
+}
+
+
+def _convert_column(series, dtype):
+    if isinstance(dtype, tuple) and dtype[0] == "datetime":
+        return pd.to_datetime(series, format=dtype[1], errors="coerce")
+    if dtype in ("float", "int"):
+        numbers = pd.to_numeric(series.astype("string").str.replace(",", "", regex=False), errors="coerce")
+        return numbers.round().astype("Int64") if dtype == "int" else numbers.astype(float)
+    return series
+
+
+def normalize_sheet(sheet_name, df):
+    """ทำความสะอาดชื่อคอลัมน์ + แปลงชนิดข้อมูลตาม schema แบบ vectorized (เรียกซ้ำกับข้อมูลที่ทำแล้วได้ผลเหมือนเดิม)"""
+    schema = SHEET_SCHEMAS.get(sheet_name, {})
+    df = df.copy()
+    df.columns = [str(c).replace('\n', '').strip() for c in df.columns]
+
+    renames = dict(schema.get("aliases", {}))
+    for canonical, keywords in schema.get("detect", {}).items():
+        if canonical not in df.columns:
+            found = next((c for c in df.columns if any(k in c for k in keywords)), None)
+            if found is not None:
+                renames[found] = canonical
+    for position, canonical in schema.get("positions", {}).items():
+        if position < len(df.columns) and canonical not in df.columns:
+            renames[df.columns[position]] = canonical
+    df = df.rename(columns=renames)
+
+    # ตัดช่องว่างหัวท้ายของทุกช่องข้อความ ช่องที่ว่างเปล่าให้เป็น NaN
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        stripped = df[col].str.strip()
+        df[col] = stripped.where(stripped != "")
+
+    for col, dtype in schema.get("columns", {}).items():
+        if col in df.columns:
+            df[col] = _convert_column(df[col], dtype)
+    return df
+
+
+# ⏱️ รอบการรีเฟรชของแต่ละชีต (วินาที) - ชีตที่เปลี่ยนบ่อยรีเฟรชถี่ ชีตที่แทบไม่เปลี่ยนรีเฟรชห่างๆ
+SHEET_REFRESH_INTERVALS = {
+    "Team_Tools": 10,
+    "Task & Workload": 15,
+    "PM_Plan": 30,
+    "Users_DB": 60,
+    "Master_Site": 300,
+    "Master_Equipment": 300,
+    "Asset_Sensor": 300,
+    "Team_Profile": 600,
+    "Learning_Content": 900,
+    "Manual_Docs": 900,
+    "Calc_Tools": 900,
+    "Quiz_Data": 1800,
+    "Quiz_Scores": 60,
+}
+DEFAULT_REFRESH_INTERVAL = 60  # ชีตที่ไม่ได้อยู่ในรายการด้านบน
+
+# ➕ ชีตที่มีแต่ต่อท้าย (GAS appendRow อย่างเดียว ไม่แก้แถวเก่า) -> รอบปกติดึงมาแค่แถวใหม่ต่อท้าย
+# ทุก FULL_RECONCILE_INTERVAL วินาทีค่อยโหลดทั้งชีตมาเทียบ เผื่อมีคนไปแก้/ลบแถวเก่าใน Google Sheet เอง
+APPEND_ONLY_SHEETS = {"Task & Workload", "Team_Tools", "Quiz_Scores"}
+# 🔎 ชีตที่หน้าเว็บอ่านทีละส่วน (load_sheet(..., filters=...)) -> ไม่ต้องโหลดทั้งชีตมารอไว้ตั้งแต่เปิดแอป
+# ให้ Google กรองมาเฉพาะแถวที่ขอ จนกว่าจะมีหน้าไหนขอทั้งชีต ถึงค่อยเก็บ snapshot และรีเฟรชตามรอบปกติ
+ON_DEMAND_SHEETS = {"Asset_Sensor"}
+QUERY_VIEW_CACHE_SIZE = 256    # จำนวนมุมมองย่อย (ชีต + เงื่อนไข) ที่เก็บไว้ใช้ซ้ำ
+FULL_RECONCILE_INTERVAL = 600
+WRITE_RECONCILE_DELAY = 5      # หลังส่งข้อมูลเข้า GAS สำเร็จ รอกี่วินาทีค่อยดึงชีตจริงมาเทียบ
+
+# 📮 คิวเขียนข้อมูลลง GAS (SQLite ในเครื่อง) - ตั้ง OUTBOX_PATH ใน secrets ได้ถ้าอยากย้ายที่เก็บ
+OUTBOX_PATH = st.secrets.get("OUTBOX_PATH", ".data/gas_outbox.sqlite3")
+OUTBOX_MAX_ATTEMPTS = 20       # ส่งไม่ผ่านเกินนี้ถือว่าล้มเหลว (ให้ Admin ตรวจสอบ)
+OUTBOX_MAX_BACKOFF = 300       # วินาที
+OUTBOX_CONFIRM_TIMEOUT = 1800  # GAS ตอบรับแล้วแต่ยังไม่เห็นข้อมูลในชีตจริงเกินนี้ (วินาที) ถือว่าหาย แจ้งคนที่บันทึก
+
+
+@dataclass(frozen=True)
+class SheetSnapshot:
+    df: pd.DataFrame
+    fetched_at: float  # time.time() ตอนที่ได้ข้อมูลชุดนี้มา
+    version: str       # รหัสเวอร์ชันของข้อมูล ใช้เป็น key ของ cache การคำนวณที่ต่อยอดจากชีตนี้
+    source_hash: str   # hash ของ CSV ดิบที่โหลดมาล่าสุด (ถ้าเหมือนเดิมก็ไม่ต้อง parse ใหม่)
+    full_fetched_at: float = 0.0  # เวลาที่โหลดทั้งชีตครั้งล่าสุด (ชีต append-only ใช้นับรอบเทียบทั้งชีต)
+
+
+@dataclass(frozen=True)
+class SheetQuery:
+    """มุมมองย่อยของชีต: เลือกเฉพาะคอลัมน์ (columns) + กรองแถว (filters = ((คอลัมน์, "=="|"!="|"contains", ค่า), ...))
+    match="all" คือต้องตรงทุกเงื่อนไข, "any" คือตรงข้อใดข้อหนึ่ง"""
+    columns: tuple = None
+    filters: tuple = ()
+    match: str = "all"
+
+    def apply(self, df):
+        """กรองจาก DataFrame ที่มีอยู่แล้วในเครื่อง (ผลเหมือนกับให้ Google กรองให้)"""
+        masks = []
+        for col, op, value in self.filters:
+            if op == "==":
+                masks.append(df[col] == value)
+            elif op == "!=":
+                masks.append(df[col].isna() | (df[col] != value))
+            else:
+                masks.append(df[col].str.contains(value, regex=False, na=False))
+        if masks:
+            combine = np.logical_or.reduce if self.match == "any" else np.logical_and.reduce
+            df = df[combine(masks)]
+        if self.columns is not None:
+            df = df[[c for c in self.columns if c in df.columns]]
+        return df.reset_index(drop=True)
+
+    def to_gviz(self, headers):
+        """แปลงเป็นคำสั่ง gviz (อ้างคอลัมน์ด้วยตัวอักษร A, B, ... ตามลำดับหัวคอลัมน์ของชีต)
+        คืน None ถ้าแปลงไม่ได้ (อ้างคอลัมน์ที่ไม่มี หรือค่ามีทั้ง ' และ ") - ให้ไปกรองในเครื่องแทน"""
+        letters = {name: _column_letter(i) for i, name in enumerate(headers)}
+        conditions = []
+        for col, op, value in self.filters:
+            value = str(value)
+            if col not in letters or ("'" in value and '"' in value):
+                return None
+            literal = f'"{value}"' if "'" in value else f"'{value}'"
+            if op == "==":
+                conditions.append(f"{letters[col]} = {literal}")
+            elif op == "!=":
+                conditions.append(f"({letters[col]} != {literal} or {letters[col]} is null)")
+            else:
+                conditions.append(f"{letters[col]} contains {literal}")
+        selected = [c for c in self.columns if c in letters] if self.columns is not None else list(headers)
+        query = "select " + ", ".join(letters[c] for c in selected)
+        if conditions:
+            query += " where " + f" {'or' if self.match == 'any' else 'and'} ".join(conditions)
+        return query, selected
+
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def apply_gas_payload(sheet_name, df, payload):
+    """จำลองผลของคำสั่ง GAS บน DataFrame (ใช้โชว์รายการที่ยังรอส่งให้เห็นในหน้าเว็บทันที)"""
+    if payload.get("action") == "update_pm_status":
+        if 'ชื่อไซต์งาน' not in df.columns or 'สถานะ PM' not in df.columns:
+            return df
+        df = df.copy()
+        df.loc[df['ชื่อไซต์งาน'] == payload["siteName"], 'สถานะ PM'] = payload["status"] or None
+        return df
+
+    return pd.concat([df, _payload_rows(sheet_name, df.columns, payload)], ignore_index=True)
+
+
+def _payload_rows(sheet_name, columns, payload):
+    """แถวใหม่ของคำสั่งต่อท้าย เรียงค่าตามลำดับคอลัมน์เหมือนที่ GAS appendRow แล้วผ่าน schema เดียวกับชีตจริง"""
+    rows = payload["rows"] if payload.get("action") == "append_rows" else [payload["data"]]
+    width = len(columns)
+    values = [[str(v) for v in row][:width] + [None] * (width - len(row)) for row in rows]
+    return normalize_sheet(sheet_name, pd.DataFrame(values, columns=columns))
+
+
+def _row_fingerprints(sheet_name, df):
+    """hash ของแต่ละแถวหลังผ่าน schema ของชีต ใช้หาว่าแถวที่ส่งไปโผล่ในชีตจริงแล้วหรือยัง (กรณี GAS ไม่ได้บอกเลขแถวมา)
+    ไม่นับคอลัมน์วันที่/เวลา (Google จัดรูปแบบใหม่ได้ตามภาษาของชีต) และยุบช่องว่างในข้อความ ตัวเลขเทียบหลังแปลงชนิดแล้ว"""
+    typed = SHEET_SCHEMAS.get(sheet_name, {}).get("columns", {})
+    keys = df[[c for c in df.columns if not isinstance(typed.get(c), tuple)]]
+    text = keys.astype("string").fillna("").apply(lambda col: col.str.split().str.join(" "))
+    return pd.util.hash_pandas_object(text, index=False).tolist()
+
+
+def _pm_status_visible(df, payload):
+    if 'ชื่อไซต์งาน' not in df.columns or 'สถานะ PM' not in df.columns:
+        return False
+    statuses = df.loc[df['ชื่อไซต์งาน'] == payload["siteName"], 'สถานะ PM']
+    return not statuses.empty and bool((statuses.fillna("").str.strip() == (payload["status"] or "").strip()).all())
+
+
+def _write_visible(sheet_name, df, payload, available, gas_row=None):
+    """คำสั่งต่อท้ายนี้อยู่ในชีตที่ดึงมาแล้วหรือยัง
+    gas_row: เลขแถวสุดท้ายที่ GAS บอกว่าเขียนลงไป (แถว 1 = หัวคอลัมน์) -> แค่ชีตยาวถึงแถวนั้นก็พอ ไม่ต้องเทียบค่า
+    ไม่มี gas_row (GAS เวอร์ชันเก่า) -> หาแถวที่ค่าตรงกันจาก available (Counter ของ hash แถวในชีต)
+    แถวที่จับคู่แล้วถูกหักออก คำสั่งที่ส่งแถวเหมือนกันสองครั้งจึงต้องเห็นสองแถว"""
+    if gas_row is not None:
+        return len(df) + 1 >= gas_row
+    needed = Counter(_row_fingerprints(sheet_name, _payload_rows(sheet_name, df.columns, payload)))
+    if any(available[h] < n for h, n in needed.items()):
+        return False
+    available.subtract(needed)
+    return True
+
+
+def describe_gas_write(payload):
+    """สรุปคำสั่งเขียนเป็นข้อความสั้นๆ ให้ผู้ใช้จำได้ว่าเป็นรายการไหน"""
+    if payload.get("action") == "update_pm_status":
+        return f"สถานะ PM ของ {payload['siteName']} -> {payload['status'] or '(ว่าง)'}"
+    rows = payload["rows"] if payload.get("action") == "append_rows" else [payload["data"]]
+    first = " | ".join(str(v) for v in rows[0][1:4]) if rows else ""
+    return f"{payload['sheet']}: {first}" + (f" (+ อีก {len(rows) - 1} แถว)" if len(rows) > 1 else "")
+
+
+@dataclass(frozen=True)
+class OutboxFailure:
+    request_id: str
+    sheet: str
+    summary: str
+    reason: str
+    created_at: float
+
+
+class GasOutbox:
+    """คิวเขียนข้อมูลแบบถาวร (SQLite): หน้าเว็บบันทึกลงเครื่องแล้วตอบผู้ใช้ทันที thread เบื้องหลังทยอยส่งเข้า GAS
+    แต่ละรายการมี requestId (idempotency key) ส่งซ้ำกี่ครั้ง GAS ก็บันทึกแค่ครั้งเดียว
+    รายการที่ยังไม่เห็นในชีตจริง (pending/sent) จะถูกซ้อนทับบน snapshot ให้เห็นในหน้าเว็บไปก่อน
+    รายการที่ส่งไม่สำเร็จ (failed) หรือส่งแล้วไม่โผล่ในชีต (lost) ถูกเก็บไว้แจ้งคนที่บันทึกจนกว่าเขาจะกดรับทราบ"""
+
+    def __init__(self, path, sender, on_flushed, metrics, on_delivered=None):
+        self._sender = sender          # ฟังก์ชันส่ง payload -> response
+        self._metrics = metrics
+        self._on_flushed = on_flushed  # เรียกเมื่อ GAS ยืนยันแล้ว (ชื่อชีต)
+        self._on_delivered = on_delivered  # เรียกด้วยข้อความแจ้งเตือนของรายการ เมื่อ GAS ตอบรับว่าบันทึกแล้ว
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                request_id TEXT UNIQUE NOT NULL,
+                sheet TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',  -- pending -> sent -> confirmed / failed / lost
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                sent_at REAL,
+                last_error TEXT,
+                owner TEXT,                             -- username ของคนที่บันทึก (ไว้แจ้งเมื่อบันทึกไม่สำเร็จ)
+                acknowledged INTEGER NOT NULL DEFAULT 0,
+                gas_row INTEGER,                        -- เลขแถวสุดท้ายที่ GAS ตอบกลับมาว่าเขียนลงไป (ถ้ามี)
+                notify TEXT                             -- ข้อความแจ้งเตือนที่ต้องส่งหลัง GAS บันทึกสำเร็จ (ถ้ามี)
+            )""")
+        # ไฟล์คิวจากเวอร์ชันก่อนยังไม่มีคอลัมน์ owner / acknowledged / gas_row / notify
+        existing = {row[1] for row in self._db.execute("PRAGMA table_info(outbox)")}
+        if "owner" not in existing:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN owner TEXT")
+        if "acknowledged" not in existing:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN acknowledged INTEGER NOT NULL DEFAULT 0")
+        if "gas_row" not in existing:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN gas_row INTEGER")
+        if "notify" not in existing:
+            self._db.execute("ALTER TABLE outbox ADD COLUMN notify TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_owner_state ON outbox (owner, state)")
+        # รายการที่ยังไม่ยืนยัน เก็บสำเนาในหน่วยความจำไว้ซ้อนทับ snapshot ได้เร็วๆ
+        # (ชีต -> {request_id: (state, sent_at, payload, gas_row)} เรียงตามลำดับที่บันทึก)
+        self._open = {}
+        for request_id, sheet, payload, state, sent_at, gas_row in self._db.execute(
+                "SELECT request_id, sheet, payload, state, sent_at, gas_row FROM outbox WHERE state IN ('pending', 'sent') ORDER BY id"):
+            self._open.setdefault(sheet, {})[request_id] = (state, sent_at, json.loads(payload), gas_row)
+        threading.Thread(target=self._run, name="gas-outbox-flusher", daemon=True).start()
+
+    def enqueue(self, payload, owner=None, notify=None):
+        """notify: ข้อความแจ้งเตือนที่จะส่งต่อให้ on_delivered หลัง GAS ตอบรับแล้วเท่านั้น (บันทึกไม่สำเร็จ = ไม่แจ้ง)"""
+        payload = dict(payload, requestId=uuid.uuid4().hex)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO outbox (request_id, sheet, payload, created_at, next_attempt_at, owner, notify) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (payload["requestId"], payload["sheet"], json.dumps(payload, ensure_ascii=False), now, now, owner, notify))
+            self._open.setdefault(payload["sheet"], {})[payload["requestId"]] = ("pending", None, payload, None)
+        self._wakeup.set()
+        return payload["requestId"]
+
+    def overlay(self, sheet_name):
+        """[(request_id, payload)] ที่ยังต้องซ้อนทับบนชีตนี้ เรียงตามลำดับที่บันทึก"""
+        with self._lock:
+            return [(rid, entry[2]) for rid, entry in self._open.get(sheet_name, {}).items()]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(len(entries) for entries in self._open.values())
+
+    def confirm(self, sheet_name, df):
+        """เลิกซ้อนทับรายการที่ GAS ตอบรับแล้ว เมื่อเห็นผลของมันใน df (ชีตที่เพิ่งดึงมา) จริงๆ เท่านั้น
+        - ต่อท้าย: ชีตยาวถึงเลขแถวที่ GAS ตอบกลับมา (GAS เก่าที่ไม่บอกเลขแถว -> หาแถวที่ค่าตรงกันแทน)
+        - สถานะ PM: สถานะในชีตตรงกับที่ส่งไป หรือมีคำสั่งใหม่กว่าของไซต์เดียวกันตามมาแล้ว (ค่าเก่าถูกทับไปแล้ว ไม่ใช่หาย)
+        gviz อัปเดตช้าก็แค่ซ้อนทับต่อไป ถ้าไม่โผล่เลยเกิน OUTBOX_CONFIRM_TIMEOUT ถือว่าหาย (lost) แจ้งคนที่บันทึก"""
+        with self._lock:
+            entries = list(self._open.get(sheet_name, {}).items())
+        sent = [(i, rid, sent_at, payload, gas_row) for i, (rid, (state, sent_at, payload, gas_row)) in enumerate(entries)
+                if state == "sent"]
+        if not sent:
+            return
+        needs_match = any(p.get("action") != "update_pm_status" and row is None for _, _, _, p, row in sent)
+        available = Counter(_row_fingerprints(sheet_name, df)) if needs_match else Counter()
+        later_sites = {}  # ไซต์ -> ตำแหน่งของคำสั่งสถานะ PM ล่าสุดในคิว
+        for i, (_, (_, _, payload, _)) in enumerate(entries):
+            if payload.get("action") == "update_pm_status":
+                later_sites[payload["siteName"]] = i
+        now = time.time()
+        done, lost = [], []
+        for i, rid, sent_at, payload, gas_row in sent:
+            if payload.get("action") == "update_pm_status":
+                visible = later_sites[payload["siteName"]] > i or _pm_status_visible(df, payload)
+            else:
+                visible = _write_visible(sheet_name, df, payload, available, gas_row)
+            if visible:
+                done.append(rid)
+            elif sent_at + OUTBOX_CONFIRM_TIMEOUT <= now:
+                lost.append(rid)
+        with self._lock:
+            entries = self._open.get(sheet_name, {})
+            for rid in done + lost:
+                entries.pop(rid, None)
+            if done:
+                self._db.executemany("UPDATE outbox SET state = 'confirmed' WHERE request_id = ?", [(rid,) for rid in done])
+            if lost:
+                self._db.executemany(
+                    "UPDATE outbox SET state = 'lost', last_error = ? WHERE request_id = ?",
+                    [(f"GAS ตอบรับแล้วแต่ไม่พบข้อมูลในชีตภายใน {OUTBOX_CONFIRM_TIMEOUT // 60} นาที", rid) for rid in lost])
+        for _ in lost:
+            self._metrics.inc("gas_outbox_flush_total", result="lost")
+
+    def failures(self, owner):
+        """รายการของคนนี้ที่ไม่ได้ถูกบันทึกจริง (failed / lost) และยังไม่ได้กดรับทราบ"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT request_id, sheet, payload, last_error, created_at FROM outbox "
+                "WHERE owner = ? AND state IN ('failed', 'lost') AND acknowledged = 0 ORDER BY id", (owner,)).fetchall()
+        return [OutboxFailure(rid, sheet, describe_gas_write(json.loads(payload)), error or "", created_at)
+                for rid, sheet, payload, error, created_at in rows]
+
+    def acknowledge(self, request_id):
+        with self._lock:
+            self._db.execute("UPDATE outbox SET acknowledged = 1 WHERE request_id = ?", (request_id,))
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=1)
+            self._wakeup.clear()
+            with self._lock:
+                due = self._db.execute(
+                    "SELECT request_id, sheet, payload, attempts, notify FROM outbox WHERE state = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT 20",
+                    (time.time(),)).fetchall()
+            for request_id, sheet, payload, attempts, notify in due:
+                self._flush_one(request_id, sheet, json.loads(payload), attempts, notify)
+
+    def _flush_one(self, request_id, sheet, payload, attempts, notify=None):
+        gas_row = None
+        try:
+            response = self._sender(payload)
+            error = None if _gas_acknowledged(response) else f"GAS ตอบกลับ: {response.text[:200]}"
+            if error is None:
+                gas_row = _gas_row(response)
+        except Exception as e:
+            error = str(e)
+
+        now = time.time()
+        self._metrics.inc("gas_outbox_flush_total",
+                          result="sent" if error is None else ("failed" if attempts + 1 >= OUTBOX_MAX_ATTEMPTS else "retry"))
+        with self._lock:
+            if error is None:
+                self._db.execute("UPDATE outbox SET state = 'sent', sent_at = ?, attempts = ?, gas_row = ? WHERE request_id = ?",
+                                 (now, attempts + 1, gas_row, request_id))
+                if request_id in self._open.get(sheet, {}):
+                    self._open[sheet][request_id] = ("sent", now, payload, gas_row)
+            elif attempts + 1 >= OUTBOX_MAX_ATTEMPTS:
+                self._db.execute("UPDATE outbox SET state = 'failed', attempts = ?, last_error = ? WHERE request_id = ?",
+                                 (attempts + 1, error, request_id))
+                self._open.get(sheet, {}).pop(request_id, None)
+            else:
+                backoff = min(2 ** attempts, OUTBOX_MAX_BACKOFF)
+                self._db.execute("UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? WHERE request_id = ?",
+                                 (attempts + 1, now + backoff, error, request_id))
+        if error is None and notify and self._on_delivered is not None:
+            try:
+                self._on_delivered(notify)
+            except Exception:
+                self._metrics.inc("gas_outbox_notify_errors_total")  # แจ้งเตือนไม่ได้ไม่ทำให้รายการที่บันทึกแล้วเสีย
+        self._on_flushed(sheet)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM outbox GROUP BY state").fetchall())
+            last_error = self._db.execute(
+                "SELECT last_error FROM outbox WHERE last_error IS NOT NULL AND state IN ('pending', 'failed', 'lost') ORDER BY id DESC LIMIT 1").fetchone()
+        return counts, (last_error[0] if last_error else None)
+
+
+class SheetHub:
+    """คลังข้อมูลกลางของทั้ง process: มี thread เบื้องหลังคอยรีเฟรชชีตตามรอบ หน้าเว็บอ่าน snapshot ล่าสุดได้ทันที"""
+
+    def __init__(self, fetcher, downloader, parser, intervals, append_only=(), metrics=None, on_demand=()):
+        self._fetcher = fetcher
+        self._metrics = metrics or Metrics()
+        self._downloader = downloader
+        self._parser = parser
+        self._intervals = dict(intervals)
+        self._append_only = set(append_only)
+        self._on_demand = set(on_demand)
+        self._lock = threading.Lock()
+        self._snapshots = {}
+        self._views = {}  # ชีต -> (key, snapshot ที่ซ้อนรายการรอส่งแล้ว)
+        self._query_views = {}  # (ชีต, SheetQuery) -> (key, snapshot ของมุมมองย่อย) เก็บไม่เกิน QUERY_VIEW_CACHE_SIZE
+        self._headers = {}      # ชีต -> ชื่อคอลัมน์มาตรฐานตามลำดับในชีต (ใช้แปลงเป็นตัวอักษรคอลัมน์ของ gviz)
+        self._last_attempt = {}
+        self._thread = None
+        self.outbox = None
+        # pool สำหรับโหลดหลายชีตพร้อมกัน (เวลารอ = ชีตที่ช้าที่สุด ไม่ใช่ผลรวมทุกชีต)
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sheet-hub-fetch")
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="sheet-hub-refresher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            for sheet_name in self.due_sheets():
+                try:
+                    self.refresh(sheet_name)
+                except Exception:
+                    pass  # รอบหน้าค่อยลองใหม่ หน้าเว็บยังใช้ snapshot เดิมได้
+            time.sleep(1)
+
+    def due_sheets(self):
+        now = time.time()
+        with self._lock:
+            return [
+                name for name, interval in self._intervals.items()
+                if now - self._last_attempt.get(name, 0) >= interval
+                and (name not in self._on_demand or name in self._snapshots)
+            ]
+
+    def refresh(self, sheet_name):
+        started_at = time.time()
+        with self._lock:
+            self._last_attempt[sheet_name] = started_at
+            self._intervals.setdefault(sheet_name, DEFAULT_REFRESH_INTERVAL)
+            current = self._snapshots.get(sheet_name)
+        if (sheet_name in self._append_only and current is not None
+                and started_at - current.full_fetched_at < FULL_RECONCILE_INTERVAL):
+            snapshot = self._refresh_tail(sheet_name, current)
+            if snapshot is not None:
+                self._metrics.inc("sheet_refresh_total", sheet=sheet_name, result="tail")
+                with self._lock:
+                    self._snapshots[sheet_name] = snapshot
+                if self.outbox is not None:
+                    self.outbox.confirm(sheet_name, snapshot.df)
+                return snapshot
+        content = self._fetcher.fetch(sheet_name, lambda: self._downloader(sheet_name))
+        source_hash = hashlib.sha1(content).hexdigest()
+        with self._lock:
+            current = self._snapshots.get(sheet_name)
+            if current is not None and current.source_hash == source_hash:
+                # ข้อมูลไม่เปลี่ยน -> ใช้ DataFrame และ version เดิม (ไม่ parse ใหม่ ไม่คำนวณใหม่)
+                snapshot = replace(current, fetched_at=time.time(), full_fetched_at=time.time())
+            else:
+                snapshot = None
+        self._metrics.inc("sheet_refresh_total", sheet=sheet_name, result="unchanged" if snapshot else "changed")
+        if snapshot is None:
+            with self._metrics.timer("sheet_parse_seconds", sheet=sheet_name):
+                df = self._parser(sheet_name, content)
+            snapshot = SheetSnapshot(df=df, fetched_at=time.time(),
+                                     version=source_hash[:12], source_hash=source_hash, full_fetched_at=time.time())
+        with self._lock:
+            self._snapshots[sheet_name] = snapshot
+        if self.outbox is not None:
+            self.outbox.confirm(sheet_name, snapshot.df)
+        return snapshot
+
+    def _refresh_tail(self, sheet_name, current):
+        """โหลดเฉพาะแถวที่ต่อท้ายมาใหม่ (gviz offset = จำนวนแถวที่มีอยู่แล้ว) แล้วต่อท้าย DataFrame เดิม
+        คืน None ถ้าต่อกันไม่ได้ (เช่นหัวคอลัมน์เปลี่ยน) ให้กลับไปโหลดทั้งชีตแทน"""
+        seen = len(current.df)
+        query = f"select * offset {seen}"
+        content = self._fetcher.fetch(f"{sheet_name}#{query}", lambda: self._downloader(sheet_name, query=query),
+                                      stats_key=f"{sheet_name}#tail")
+        tail = self._parser(sheet_name, content)
+        if tail.empty:
+            return replace(current, fetched_at=time.time())
+        if list(tail.columns) != list(current.df.columns):
+            return None
+        # version ต่อยอดจากของเดิม: ข้อมูลเดิม + แถวใหม่ชุดนี้
+        source_hash = hashlib.sha1(current.source_hash.encode() + content).hexdigest()
+        df = pd.concat([current.df, tail], ignore_index=True)
+        return replace(current, df=df, fetched_at=time.time(), version=source_hash[:12], source_hash=source_hash)
+
+    def _with_pending_writes(self, sheet_name, snapshot):
+        writes = self.outbox.overlay(sheet_name) if self.outbox is not None else []
+        if not writes:
+            return snapshot
+        key = (snapshot.version, tuple(rid for rid, _ in writes))
+        with self._lock:
+            cached = self._views.get(sheet_name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        df = snapshot.df
+        for _, payload in writes:
+            df = apply_gas_payload(sheet_name, df, payload)
+        view = replace(snapshot, df=df, version=f"{snapshot.version}+{hashlib.sha1(repr(key).encode()).hexdigest()[:8]}")
+        with self._lock:
+            self._views[sheet_name] = (key, view)
+        return view
+
+    def get(self, sheet_name):
+        snapshot = self._snapshots.get(sheet_name)
+        self._metrics.inc("sheet_cache_total", sheet=sheet_name, result="miss" if snapshot is None else "hit")
+        if snapshot is None:
+            # ยังไม่เคยโหลด -> ต้องรอโหลดครั้งแรก
+            snapshot = self.refresh(sheet_name)
+        return self._with_pending_writes(sheet_name, snapshot)
+
+    def get_many(self, sheet_names, return_exceptions=False):
+        futures = {}
+        results = {}
+        for name in dict.fromkeys(sheet_names):
+            snapshot = self._snapshots.get(name)
+            self._metrics.inc("sheet_cache_total", sheet=name, result="miss" if snapshot is None else "hit")
+            if snapshot is not None:
+                results[name] = snapshot
+            else:
+                futures[name] = self._pool.submit(self.refresh, name)
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results[name] = e
+        return [
+            results[name] if isinstance(results[name], Exception) else self._with_pending_writes(name, results[name])
+            for name in sheet_names
+        ]
+
+    def query(self, sheet_name, query):
+        """มุมมองย่อยของชีต ถ้าในเครื่องมี snapshot อยู่แล้ว (หรือมีรายการรอส่งที่ต้องซ้อนให้เห็น) ก็กรองจากของที่มี
+        cache ไว้ต่อ version - ถ้ายังไม่มี ให้ Google กรองให้ (gviz tq) แล้วโหลดมาแค่แถว/คอลัมน์ที่ใช้จริง
+        (cache ไว้ตามรอบรีเฟรชของชีต)"""
+        cache_key = (sheet_name, query)
+        pending = self.outbox is not None and self.outbox.overlay(sheet_name)
+        if sheet_name in self._snapshots or pending or "positions" in SHEET_SCHEMAS.get(sheet_name, {}):
+            base = self.get(sheet_name)
+            with self._lock:
+                cached = self._query_views.get(cache_key)
+            if cached is not None and cached[0] == base.version:
+                self._metrics.inc("sheet_query_total", sheet=sheet_name, result="hit")
+                return cached[1]
+            self._metrics.inc("sheet_query_total", sheet=sheet_name, result="local")
+            view = replace(base, df=query.apply(base.df),
+                           version=f"{base.version}?{hashlib.sha1(repr(query).encode()).hexdigest()[:8]}")
+            key = base.version
+        else:
+            with self._lock:
+                cached = self._query_views.get(cache_key)
+                interval = self._intervals.get(sheet_name, DEFAULT_REFRESH_INTERVAL)
+            if cached is not None and time.time() - cached[1].fetched_at < interval:
+                self._metrics.inc("sheet_query_total", sheet=sheet_name, result="hit")
+                return cached[1]
+            self._metrics.inc("sheet_query_total", sheet=sheet_name, result="pushdown")
+            view = self._pushdown(sheet_name, query)
+            if view is None:
+                self.get(sheet_name)  # แปลงเป็น gviz ไม่ได้ -> โหลดทั้งชีตมากรองในเครื่อง
+                return self.query(sheet_name, query)
+            key = view.version
+        with self._lock:
+            self._query_views.pop(cache_key, None)
+            self._query_views[cache_key] = (key, view)
+            while len(self._query_views) > QUERY_VIEW_CACHE_SIZE:
+                self._query_views.pop(next(iter(self._query_views)))  # ทิ้งมุมมองที่เก่าที่สุด
+        return view
+
+    def _pushdown(self, sheet_name, query):
+        if sheet_name not in self._headers:
+            content = self._fetcher.fetch(f"{sheet_name}#header", lambda: self._downloader(sheet_name, query="select * limit 0"))
+            self._headers[sheet_name] = list(self._parser(sheet_name, content).columns)
+        gviz = query.to_gviz(self._headers[sheet_name])
+        if gviz is None:
+            return None
+        tq, selected = gviz
+        content = self._fetcher.fetch(f"{sheet_name}#{tq}", lambda: self._downloader(sheet_name, query=tq),
+                                      stats_key=f"{sheet_name}#query")
+        df = pd.read_csv(io.BytesIO(content), dtype=str, keep_default_na=False, na_values=[''])
+        df.columns = selected  # gviz ส่งหัวคอลัมน์ดิบมา -> ใช้ชื่อมาตรฐานตามที่เลือกไว้
+        source_hash = hashlib.sha1(content).hexdigest()
+        return SheetSnapshot(df=normalize_sheet(sheet_name, df), fetched_at=time.time(),
+                             version=f"q{source_hash[:12]}", source_hash=source_hash)
+
+    def schedule_reconcile(self, sheet_name):
+        # ให้ thread เบื้องหลังดึงของจริงมาเทียบอีกรอบหลัง Google อัปเดตชีตเสร็จ
+        with self._lock:
+            interval = self._intervals.get(sheet_name, DEFAULT_REFRESH_INTERVAL)
+            self._last_attempt[sheet_name] = min(self._last_attempt.get(sheet_name, 0),
+                                                 time.time() - interval + WRITE_RECONCILE_DELAY)
+
+    def status(self):
+        now = time.time()
+        with self._lock:
+            return {
+                name: {"version": snap.version, "age_s": round(now - snap.fetched_at, 1), "rows": len(snap.df), "interval_s": self._intervals.get(name)}
+                for name, snap in self._snapshots.items()
+            }
+
+
+def _notify_line(message):
+    # notify.py import โมดูลนี้อยู่แล้ว จึง import ตอนเรียกใช้ (ไม่ให้ import วนกัน)
+    from sensorapp.notify import get_line_dispatcher
+    get_line_dispatcher().submit(message)
+
+
+@st.cache_resource
+def get_sheet_hub():
+    hub = SheetHub(get_sheet_fetcher(), _download_sheet, _parse_sheet_csv, SHEET_REFRESH_INTERVALS, APPEND_ONLY_SHEETS,
+                   metrics=get_metrics(), on_demand=ON_DEMAND_SHEETS)
+    hub.outbox = GasOutbox(OUTBOX_PATH, post_to_gas, on_flushed=hub.schedule_reconcile, metrics=get_metrics(),
+                           on_delivered=_notify_line)
+    hub.start()
+    return hub
+
+
+def sheets_read_this_run():
+    """ชื่อชีต -> snapshot ที่หน้านี้ใช้ (ไว้โชว์ความสดของข้อมูล และอ้าง version)
+    เก็บใน session_state เพราะโมดูลนี้ import ครั้งเดียวใช้ร่วมทุก session - app.py ล้างค่าทุกต้นรอบด้วย begin_run()"""
+    return st.session_state.setdefault("_sheets_read_this_run", {})
+
+
+def begin_run():
+    st.session_state["_sheets_read_this_run"] = {}
+
+
+def load_sheet(sheet_name, columns=None, filters=(), match="all"):
+    """โหลดชีตทั้งก้อน หรือเฉพาะบางคอลัมน์/บางแถว (columns, filters, match ดู SheetQuery)"""
+    if columns is None and not filters:
+        snapshot = get_sheet_hub().get(sheet_name)
+    else:
+        query = SheetQuery(tuple(columns) if columns is not None else None, tuple(filters), match)
+        snapshot = get_sheet_hub().query(sheet_name, query)
+    sheets_read_this_run()[sheet_name] = snapshot
+    return snapshot.df.copy()  # คืนสำเนา เพราะหน้าเว็บชอบแก้ชื่อคอลัมน์ในตัว DataFrame
+
+
+def sheet_version(sheet_name):
+    """version ของชีตที่หน้านี้เพิ่งโหลดไป - ส่งเข้าฟังก์ชันคำนวณที่ cache ไว้ตาม version"""
+    return sheets_read_this_run()[sheet_name].version
+
+
+def post_to_gas(payload, timeout=30):
+    metrics = get_metrics()
+    action = payload.get("action", "append")
+    try:
+        with metrics.timer("gas_request_seconds", action=action):
+            response = get_http_session().post(GAS_URL, data=json.dumps(payload), timeout=timeout)
+    except requests.RequestException:
+        metrics.inc("gas_requests_total", action=action, status="network_error")
+        raise
+    metrics.inc("gas_requests_total", action=action, status=response.status_code)
+    return response
+
+
+def _gas_acknowledged(response):
+    try:
+        return response.json().get("status") == "success"
+    except ValueError:
+        return False
+
+
+def _gas_row(response):
+    """เลขแถวสุดท้ายที่ GAS เขียนลงไป ({"status": "success", "row": 123}) - GAS เวอร์ชันเก่าไม่ได้ส่งมา คืน None"""
+    try:
+        row = response.json().get("row")
+        return int(row) if row is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def submit_gas_write(payload, notify=None):
+    """บันทึกคำสั่งเขียนลงคิวในเครื่อง แล้วกลับทันที (thread เบื้องหลังส่งเข้า GAS ให้เอง พร้อม retry)
+    หน้าเว็บจะเห็นข้อมูลใหม่ทันทีเพราะรายการที่รอส่งถูกซ้อนทับบน snapshot ของชีตนั้น
+    ถ้าสุดท้ายไม่ถูกบันทึกจริง คนที่บันทึก (username ของ session นี้) จะเห็นแจ้งเตือนใน sidebar
+    notify: ข้อความที่จะส่งเข้ากลุ่ม LINE หลัง GAS บันทึกสำเร็จแล้วเท่านั้น"""
+    return get_sheet_hub().outbox.enqueue(payload, owner=st.session_state.get('username'), notify=notify)
+
+
+def append_rows_to_gas(sheet_name, rows):
+    """บันทึกหลายแถวเป็นคำสั่งเดียว (action "append_rows") - GAS เขียนทั้งชุดด้วย setValues ครั้งเดียว
+    ได้ทั้งหมดหรือไม่ได้เลย"""
+    return submit_gas_write({"action": "append_rows", "sheet": sheet_name, "rows": rows})
+
+
+def load_sheets(sheet_names, return_exceptions=False):
+    """โหลดหลายชีตพร้อมกันแบบขนาน คืนค่าเป็น list ตามลำดับชื่อที่ส่งเข้ามา
+    (return_exceptions=True: ชีตที่โหลดไม่ได้จะคืนเป็นตัว Exception แทนการ raise)"""
+    results = []
+    read = sheets_read_this_run()
+    for name, snapshot in zip(sheet_names, get_sheet_hub().get_many(sheet_names, return_exceptions)):
+        if isinstance(snapshot, Exception):
+            results.append(snapshot)
+        else:
+            read[name] = snapshot
+            results.append(snapshot.df.copy())
+    return results
@@ -0,0 +1,175 @@
+"""🧮 ตัวคำนวณสูตรจากแผ่น Calc_Tools: แปลงสมการเป็น AST ที่ตรวจแล้วว่ามีแค่เลขคณิต + ฟังก์ชันคณิตศาสตร์ที่อนุญาต
+compile ครั้งเดียวต่อ version ของชีต แล้วใช้ได้ทั้งค่าเดียว (ช่องกรอก) และทั้งคอลัมน์ (อัปโหลด CSV) ในรอบเดียวด้วย numpy"""
+import ast
+import io
+import tokenize
+from dataclasses import dataclass
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ฟังก์ชันที่ใช้ในสมการได้ (ชื่อใน GSheet -> ฟังก์ชัน numpy ที่รับได้ทั้งตัวเลขเดี่ยวและทั้ง array)
+FORMULA_FUNCTIONS = {
+    "sqrt": np.sqrt, "abs": np.abs, "exp": np.exp, "log": np.log, "log10": np.log10, "ln": np.log,
+    "sin": np.sin, "cos": np.cos, "tan": np.tan, "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "radians": np.radians, "degrees": np.degrees, "floor": np.floor, "ceil": np.ceil,
+    "round": lambda value, digits=0: np.round(value, int(digits)),
+    "min": lambda *args: reduce(np.minimum, args), "max": lambda *args: reduce(np.maximum, args),
+}
+FORMULA_CONSTANTS = {"pi": np.pi, "e": np.e}
+_ALLOWED_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub)
+_MULTIPLY_WORDS = {"x", "X"}
+
+
+class FormulaError(ValueError):
+    """สมการใน Calc_Tools ใช้ไม่ได้ (ข้อความเป็นภาษาไทย โชว์ให้ผู้ใช้ได้เลย)"""
+
+
+def _normalize(equation):
+    """เขียนแบบที่ทีมใช้ใน GSheet -> Python: "V x I" / "V × I" -> "V * I", "r ^ 2" -> "r ** 2"
+    x ถือเป็นเครื่องหมายคูณเฉพาะตอนที่ยืนเดี่ยวๆ ระหว่างตัวเลข/ตัวแปร 2 ตัว (ชื่อที่มี x อยู่ข้างในไม่โดนแตะ
+    และถ้าตั้งตัวแปรชื่อ x เอง "x x y" ก็ยังอ่านเป็น x * y เพราะชื่อสองตัวติดกันไม่มีความหมายอื่น)"""
+    text = equation.replace("×", "*").replace("÷", "/").replace("^", "**").strip()
+    try:
+        tokens = [t for t in tokenize.generate_tokens(io.StringIO(text).readline)
+                  if t.type not in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER)]
+    except (tokenize.TokenError, SyntaxError) as e:
+        raise FormulaError(f"อ่านสมการไม่ออก: {e}") from None
+
+    def ends_operand(token):
+        return token.type in (tokenize.NAME, tokenize.NUMBER) or token.string == ")"
+
+    def starts_operand(token):
+        return token.type in (tokenize.NAME, tokenize.NUMBER) or token.string in ("(", "-", "+")
+
+    parts = []
+    for i, token in enumerate(tokens):
+        if (token.type == tokenize.NAME and token.string in _MULTIPLY_WORDS
+                and 0 < i < len(tokens) - 1 and ends_operand(tokens[i - 1]) and starts_operand(tokens[i + 1])):
+            parts.append("*")
+        else:
+            parts.append(token.string)
+    return " ".join(parts)
+
+
+class _Validator(ast.NodeTransformer):
+    """ยอมให้มีแค่ ตัวเลข, ตัวแปรที่ประกาศไว้, ค่าคงที่, + - * / // % **, และเรียกฟังก์ชันใน FORMULA_FUNCTIONS
+    ตัวเลขจำนวนเต็มถูกแปลงเป็นทศนิยม (9 ** 9 ** 9 จะ overflow ทันทีแทนที่จะคำนวณเลขยักษ์จนเซิร์ฟเวอร์ค้าง)"""
+
+    def __init__(self, variables):
+        self.variables = set(variables)
+        self.unknown = set()
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + _ALLOWED_OPERATORS):
+            raise FormulaError(f"ใช้ '{type(node).__name__}' ในสมการไม่ได้ (ได้แค่เลขคณิตและฟังก์ชันคณิตศาสตร์)")
+        return super().generic_visit(node)
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise FormulaError(f"ค่าคงที่ {node.value!r} ไม่ใช่ตัวเลข")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+    def visit_Name(self, node):
+        if node.id not in self.variables and node.id not in FORMULA_CONSTANTS:
+            self.unknown.add(node.id)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FORMULA_FUNCTIONS or node.keywords:
+            name = node.func.id if isinstance(node.func, ast.Name) else ast.unparse(node.func)
+            raise FormulaError(f"ไม่รู้จักฟังก์ชัน '{name}' (ใช้ได้: {', '.join(sorted(FORMULA_FUNCTIONS))})")
+        func = FORMULA_FUNCTIONS[node.func.id]
+        if isinstance(func, np.ufunc) and len(node.args) != func.nin:
+            # ufunc รับค่าเกินได้ (ค่าที่เกินกลายเป็น out= ที่เขียนทับตัวแปร) จึงต้องตรวจจำนวนเอง
+            raise FormulaError(f"ฟังก์ชัน '{node.func.id}' ต้องใส่ {func.nin} ค่า")
+        digits = node.args[1] if node.func.id == "round" and len(node.args) == 2 else None
+        if isinstance(digits, ast.UnaryOp) and isinstance(digits.op, (ast.UAdd, ast.USub)):
+            digits = digits.operand  # round(V, -2) ปัดหลักร้อย
+        if digits is not None and not isinstance(digits, ast.Constant):
+            # จำนวนตำแหน่งทศนิยมต้องเป็นตัวเลขตายตัว (ถ้าเป็นตัวแปร ตอนคำนวณจาก CSV จะได้ทั้งคอลัมน์ ปัดไม่ได้)
+            raise FormulaError("round(ค่า, ตำแหน่งทศนิยม) ตำแหน่งทศนิยมต้องเป็นตัวเลข เช่น round(V / 3, 2)")
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+
+@dataclass(frozen=True)
+class Formula:
+    name: str
+    variables: tuple
+    equation: str
+    unit: str
+    description: str
+    code: object = None     # bytecode ที่ compile แล้ว (None = สมการใช้ไม่ได้ ดู error)
+    error: str = None
+
+    def evaluate(self, values):
+        """values: ชื่อตัวแปร -> ตัวเลข หรือ array (ทุกตัวยาวเท่ากัน) คืนค่าชนิดเดียวกัน
+        หารด้วยศูนย์/ค่านอกโดเมนได้ inf หรือ nan (ไม่ raise) ให้หน้าเว็บตัดสินใจเองว่าจะโชว์อย่างไร"""
+        if self.code is None:
+            raise FormulaError(self.error)
+        scope = {**FORMULA_FUNCTIONS, **FORMULA_CONSTANTS}
+        scope.update({name: np.asarray(values[name], dtype=float) for name in self.variables})
+        with np.errstate(all="ignore"):
+            try:
+                return eval(self.code, {"__builtins__": {}}, scope)
+            except ArithmeticError:
+                # เกิดเฉพาะตอนคำนวณส่วนที่เป็นค่าคงที่ล้วน (เช่น 1 / 0, 9 ** 9 ** 9) ซึ่งไม่ได้เป็น numpy
+                return np.float64(np.nan)
+
+
+def compile_formula(name, variables, equation, unit="", description=""):
+    """แปลง + ตรวจ + compile สมการ 1 สูตร - สมการที่ใช้ไม่ได้จะได้ Formula ที่มี error แทนการ raise"""
+    formula = Formula(name, tuple(variables), equation, unit, description)
+    try:
+        bad = [v for v in variables if not v.isidentifier()]
+        if bad:
+            raise FormulaError(f"ชื่อตัวแปร {', '.join(bad)} ใช้ในสมการไม่ได้ (ห้ามมีช่องว่าง/สัญลักษณ์ และห้ามขึ้นต้นด้วยตัวเลข)")
+        try:
+            tree = ast.parse(_normalize(equation), mode="eval")
+        except SyntaxError as e:
+            raise FormulaError(f"สมการผิดรูปแบบ: {e.msg}") from None
+        validator = _Validator(variables)
+        tree = ast.fix_missing_locations(validator.visit(tree))
+        if validator.unknown:
+            raise FormulaError(f"สมการใช้ตัวแปรที่ไม่ได้ประกาศไว้ในช่อง 'ชื่อตัวแปร': {', '.join(sorted(validator.unknown))}")
+        formula = Formula(**{**formula.__dict__, "code": compile(tree, f"<{name}>", "eval")})
+        try:
+            formula.evaluate({v: 1.0 for v in variables})  # ลองรัน 1 ครั้ง: จับการเรียกฟังก์ชันผิดจำนวนค่า เช่น sqrt(V, I)
+        except TypeError:
+            raise FormulaError("เรียกฟังก์ชันด้วยจำนวนค่าไม่ถูกต้อง") from None
+        return formula
+    except FormulaError as e:
+        return Formula(**{**formula.__dict__, "error": str(e)})
+
+
+def _text(value):
+    text = str(value).strip() if not pd.isna(value) else ""
+    return "" if text.lower() == "nan" else text
+
+
+@st.cache_resource(max_entries=2)
+def compile_calc_tools(calc_version, _df_calc):
+    """ชื่อสูตร -> Formula ของทุกแถวใน Calc_Tools (compile ครั้งเดียวต่อ version ของชีต ใช้ร่วมทุก session)"""
+    formulas = {}
+    for _, row in _df_calc.iterrows():
+        name = _text(row.get('ชื่อสูตร', ''))
+        if not name or name in formulas:
+            continue
+        variables = [v.strip() for v in _text(row.get('ชื่อตัวแปร', '')).split(',') if v.strip()]
+        formulas[name] = compile_formula(name, variables, _text(row.get('สมการ', '')),
+                                         _text(row.get('หน่วยผลลัพธ์', '')), _text(row.get('คำอธิบาย', '')))
+    return formulas
+
+
+def evaluate_table(formula, df):
+    """คำนวณทุกแถวของ DataFrame ในรอบเดียว (คอลัมน์ชื่อเดียวกับตัวแปร) คืน Series ผลลัพธ์
+    ช่องที่ไม่ใช่ตัวเลข/ว่าง -> ผลของแถวนั้นเป็น NaN"""
+    missing = [v for v in formula.variables if v not in df.columns]
+    if missing:
+        raise FormulaError(f"ไฟล์ไม่มีคอลัมน์ {', '.join(missing)}")
+    values = {v: pd.to_numeric(df[v], errors="coerce").to_numpy(dtype=float) for v in formula.variables}
+    result = np.broadcast_to(formula.evaluate(values), (len(df),))
+    return pd.Series(result, index=df.index, dtype=float)
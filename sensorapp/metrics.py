@@ -0,0 +1,81 @@
+"""ตัวนับ/ตัวจับเวลาของ process (ใช้ร่วมกันทุก session)"""
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import streamlit as st
+
+# 📈 --- ตัววัดประสิทธิภาพ (เก็บในหน่วยความจำของ process ดูได้ที่เมนู Diagnostics หรือ /metrics) --- 📈
+METRICS_SAMPLES = 500  # เก็บค่าล่าสุดกี่ค่าต่อ 1 ตัววัด ไว้คำนวณ p50/p95
+
+
+class Metrics:
+    """ตัวนับ (counter) และเวลาที่ใช้ (timing) แยกตาม label - ใช้ร่วมกันทุก session และทุก thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = Counter()  # (ชื่อ, labels) -> ค่า
+        self._timings = {}          # (ชื่อ, labels) -> {"count", "sum", "samples"}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += value
+
+    def observe(self, name, seconds, **labels):
+        with self._lock:
+            timing = self._timings.setdefault(self._key(name, labels),
+                                              {"count": 0, "sum": 0.0, "samples": deque(maxlen=METRICS_SAMPLES)})
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["samples"].append(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counters(self):
+        with self._lock:
+            return [(name, dict(labels), value) for (name, labels), value in sorted(self._counters.items())]
+
+    def timings(self):
+        """[(ชื่อ, labels, count, sum, p50, p95, max)] จากค่าล่าสุดที่เก็บไว้"""
+        with self._lock:
+            items = [(key, t["count"], t["sum"], sorted(t["samples"])) for key, t in sorted(self._timings.items())]
+        return [
+            (name, dict(labels), count, total, samples[len(samples) // 2], samples[int(len(samples) * 0.95)], samples[-1])
+            for (name, labels), count, total, samples in items
+        ]
+
+    def to_prometheus(self, extra_gauges=()):
+        """ข้อความรูปแบบ Prometheus text exposition (counter / summary / gauge)"""
+        def fmt(labels):
+            if not labels:
+                return ""
+            escaped = {k: str(v).replace("\\", "\\\\").replace('"', '\\"') for k, v in labels.items()}
+            return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+        lines = []
+        for name, labels, value in self.counters():
+            lines.append(f"sensor_{name}{fmt(labels)} {value}")
+        for name, labels, count, total, p50, p95, _ in self.timings():
+            lines.append(f"sensor_{name}{fmt({**labels, 'quantile': '0.5'})} {p50:.6f}")
+            lines.append(f"sensor_{name}{fmt({**labels, 'quantile': '0.95'})} {p95:.6f}")
+            lines.append(f"sensor_{name}_count{fmt(labels)} {count}")
+            lines.append(f"sensor_{name}_sum{fmt(labels)} {total:.6f}")
+        for name, labels, value in extra_gauges:
+            lines.append(f"sensor_{name}{fmt(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+@st.cache_resource
+def get_metrics():
+    return Metrics()
@@ -0,0 +1,63 @@
+"""ค่าสถานะที่ส่งออกไปกับ /metrics และ HTTP server เล็กๆ ที่ตอบ /metrics"""
+import logging
+import threading
+
+import streamlit as st
+
+from sensorapp.data import get_sheet_fetcher, get_sheet_hub
+from sensorapp.metrics import get_metrics
+from sensorapp.notify import get_line_dispatcher
+
+
+def metrics_gauges():
+    """ค่าสถานะ ณ ตอนนี้ (ไม่ใช่ตัวนับสะสม) ที่ส่งออกไปพร้อม /metrics: อายุข้อมูลแต่ละชีต, คิว GAS, LINE, ตัวนับของ fetcher"""
+    gauges = []
+    for sheet, status in get_sheet_hub().status().items():
+        gauges.append(("sheet_age_seconds", {"sheet": sheet}, status["age_s"]))
+        gauges.append(("sheet_rows", {"sheet": sheet}, status["rows"]))
+    for key, counts in get_sheet_fetcher().stats().items():
+        for result, value in counts.items():
+            gauges.append(("fetch_calls", {"key": key, "result": result}, value))
+    outbox_counts, _ = get_sheet_hub().outbox.stats()
+    for state, value in outbox_counts.items():
+        gauges.append(("gas_outbox_items", {"state": state}, value))
+    for result, value in get_line_dispatcher().stats().items():
+        gauges.append(("line_messages", {"result": result}, value))
+    return gauges
+
+
+METRICS_PORT = st.secrets.get("METRICS_PORT")  # ตั้งไว้ = เปิด http://<host>:<port>/metrics ให้ Prometheus มาเก็บ
+# /metrics ไม่มีการยืนยันตัวตน -> ค่าเริ่มต้นเปิดให้เฉพาะเครื่องนี้ ตั้ง METRICS_HOST = "0.0.0.0" ถ้า Prometheus อยู่เครื่องอื่น
+METRICS_HOST = st.secrets.get("METRICS_HOST", "127.0.0.1")
+
+logger = logging.getLogger(__name__)
+
+
+@st.cache_resource
+def start_metrics_server(port, host=METRICS_HOST):
+    """เปิด HTTP server เล็กๆ ใน thread เบื้องหลัง ตอบ /metrics เป็น Prometheus text (เปิดครั้งเดียวต่อ process)
+    เปิด port ไม่ได้ (เช่นมี worker อื่นในเครื่องเดียวกันจองไว้แล้ว) -> บันทึก log ครั้งเดียวแล้วคืน None หน้าเว็บทำงานต่อตามปกติ"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = get_metrics().to_prometheus(metrics_gauges()).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    try:
+        server = ThreadingHTTPServer((host, int(port)), MetricsHandler)
+    except OSError as e:
+        logger.warning("เปิด /metrics ที่ %s:%s ไม่ได้ (%s) - ข้ามไป ไม่มี /metrics ใน process นี้", host, port, e)
+        return None
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
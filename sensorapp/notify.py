@@ -0,0 +1,137 @@
+"""📨 ส่งแจ้งเตือนเข้ากลุ่ม LINE ผ่านคิวเบื้องหลัง (หน้าเว็บไม่ต้องรอ LINE ตอบ)"""
+import json
+import queue
+import threading
+import time
+from collections import Counter
+
+import requests
+import streamlit as st
+
+from sensorapp.data import get_http_session
+from sensorapp.metrics import get_metrics
+
+
+LINE_PUSH_URL = st.secrets.get("LINE_PUSH_URL", "https://api.line.me/v2/bot/message/push")  # ชี้ไปเซิร์ฟเวอร์จำลองได้ตอนทดสอบ
+LINE_QUEUE_SIZE = 200       # ข้อความรอส่งได้สูงสุดกี่รายการ (เต็มแล้วจะทิ้งข้อความใหม่ ไม่ให้หน้าเว็บค้าง)
+LINE_DIGEST_WINDOW = 5      # วินาที: ข้อความที่เข้ามาติดๆ กันในช่วงนี้จะรวมเป็นข้อความเดียว
+LINE_MAX_RETRIES = 5
+LINE_MAX_TEXT = 4500        # LINE รับข้อความได้ไม่เกิน 5000 ตัวอักษร (เผื่อที่ให้ @all)
+
+
+def _line_payload(group_id, message):
+    # 🌟 สำคัญ: รวม @all เข้ากับข้อความหลัก (เคาะบรรทัดใหม่ด้วย \n)
+    full_text = f"@all \n{message}"
+    
+    return {
+        "to": group_id,
+        "messages": [
+            {
+                "type": "text",
+                "text": full_text,
+                "mention": { # 👈 นี่คือ "กล่องคุมการแท็ก"
+                    "mentions": [
+                        {
+                            "index": 0,    # 0 คือเริ่มแท็กที่ตัวอักษรที่ 1 (ตัว @)
+                            "length": 4,   # 4 คือคลุมคำว่า @all (ห้ามขาดห้ามเกิน)
+                            "type": "all"  # บอก LINE ว่า "นี่คือการแท็กทุกคนนะ"
+                        }
+                    ]
+                }
+            }
+        ]
+    }
+
+
+def _line_digests(messages):
+    """รวมหลายข้อความเป็นข้อความสรุป (แบ่งเป็นหลายก้อนถ้ายาวเกินที่ LINE รับได้)"""
+    if len(messages) == 1:
+        return [messages[0][:LINE_MAX_TEXT]]
+    digests, current = [], []
+    for message in messages:
+        if current and len("\n\n".join(current + [message])) > LINE_MAX_TEXT:
+            digests.append(current)
+            current = []
+        current.append(message[:LINE_MAX_TEXT])
+    digests.append(current)
+    return [
+        f"📦 สรุปรายการแจ้งเตือน {len(chunk)} รายการ\n\n" + "\n\n".join(chunk) if len(chunk) > 1 else chunk[0]
+        for chunk in digests
+    ]
+
+
+class LineDispatcher:
+    """ส่ง LINE จาก thread เบื้องหลัง: หน้าเว็บแค่โยนข้อความเข้าคิวแล้วไปต่อได้เลย
+    ข้อความที่มาเป็นชุดจะถูกรวมเป็น digest และส่งซ้ำแบบ backoff ถ้า LINE ตอบช้า/ล่ม"""
+
+    def __init__(self, token, group_id, session):
+        self._headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+        self._group_id = group_id
+        self._session = session
+        self._queue = queue.Queue(maxsize=LINE_QUEUE_SIZE)
+        self._lock = threading.Lock()   # _stats ถูกเพิ่มค่าทั้งจาก thread ของหน้าเว็บและ thread ส่ง LINE
+        self._stats = Counter()
+        self.last_error = None
+        threading.Thread(target=self._run, name="line-dispatcher", daemon=True).start()
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self):
+        """สำเนาตัวนับ: queued / dropped / sent / retries / failed"""
+        with self._lock:
+            return dict(self._stats)
+
+    def submit(self, message):
+        try:
+            self._queue.put_nowait(message)
+            self._count("queued")
+            return True
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.time() + LINE_DIGEST_WINDOW
+            while (remaining := deadline - time.time()) > 0:
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            for text in _line_digests(batch):
+                self._deliver(text)
+
+    def _deliver(self, text):
+        data = json.dumps(_line_payload(self._group_id, text))
+        metrics = get_metrics()
+        for attempt in range(LINE_MAX_RETRIES):
+            try:
+                with metrics.timer("line_request_seconds"):
+                    response = self._session.post(LINE_PUSH_URL, headers=self._headers, data=data, timeout=10)
+                metrics.inc("line_requests_total", status=response.status_code)
+                if response.status_code == 200:
+                    self._count("sent")
+                    return
+                self.last_error = f"LINE Error {response.status_code}: {response.text}"
+                if response.status_code < 500 and response.status_code != 429:
+                    break  # ข้อมูลผิด/token ผิด ส่งซ้ำก็ไม่ผ่าน
+            except requests.RequestException as e:
+                metrics.inc("line_requests_total", status="network_error")
+                self.last_error = f"ระบบส่ง LINE ขัดข้อง: {e}"
+            self._count("retries")
+            time.sleep(min(2 ** attempt, 30))
+        self._count("failed")
+
+
+@st.cache_resource
+def get_line_dispatcher():
+    return LineDispatcher(st.secrets["LINE_CHANNEL_TOKEN"], st.secrets["LINE_GROUP_ID"], get_http_session())
+
+
+def send_line_message(message):
+    # ไม่รอ LINE ตอบ: เข้าคิวแล้วกลับทันที ที่เหลือ thread เบื้องหลังจัดการ
+    if not get_line_dispatcher().submit(message):
+        st.warning("คิวแจ้งเตือน LINE เต็ม ข้อความนี้จะไม่ถูกส่งเข้ากลุ่ม")
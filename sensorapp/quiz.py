@@ -0,0 +1,112 @@
+"""📝 แบบทดสอบจากแผ่น Quiz_Data: เฉลยถูกเตรียมครั้งเดียวต่อ version ของชีต ตรวจทั้งชุดในการส่งครั้งเดียว
+แล้วเก็บคะแนนลงแผ่น Quiz_Scores (1 แถวต่อการทำ 1 ครั้ง)"""
+import hashlib
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+QUIZ_OPTION_COLUMNS = ['ตัวเลือก A', 'ตัวเลือก B', 'ตัวเลือก C', 'ตัวเลือก D']
+QUIZ_SCORES_SHEET = "Quiz_Scores"
+# GAS บันทึกเป็น [เวลา, ชื่อ, ชุดข้อสอบ, คะแนน, คะแนนเต็ม, ข้อที่ผิด]
+QUIZ_SCORE_COLUMNS = ["เวลา", "ชื่อ", "ชุดข้อสอบ", "คะแนน", "คะแนนเต็ม", "ข้อที่ผิด"]
+
+
+@dataclass(frozen=True)
+class QuizQuestion:
+    number: int          # ข้อที่ (เริ่มจาก 1 ตามลำดับแถวในชีต)
+    question: str
+    options: tuple
+    answer: int = None   # ตำแหน่งของตัวเลือกที่ถูก (None = เฉลยในชีตไม่ตรงกับตัวเลือกไหนเลย ข้อนี้ไม่นับคะแนน)
+    answer_text: str = ""
+    explain: str = ""
+
+
+@dataclass(frozen=True)
+class QuizResult:
+    score: int
+    total: int
+    wrong: tuple         # QuizQuestion ที่ตอบผิดหรือไม่ได้ตอบ (เรียงตามข้อ)
+
+    @property
+    def percent(self):
+        return 100.0 * self.score / self.total if self.total else 0.0
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    quiz_id: str         # รหัสชุดข้อสอบ "Q" + hash ของคำถาม+ตัวเลือก+เฉลย (แก้ข้อสอบเมื่อไหร่ได้ชุดใหม่)
+    questions: tuple
+
+    @property
+    def gradable(self):
+        return [q for q in self.questions if q.answer is not None]
+
+    def grade(self, answers):
+        """answers: ข้อที่ -> ตำแหน่งตัวเลือกที่เลือก (None = ไม่ได้ตอบ) ตรวจทั้งชุดทีเดียว"""
+        wrong = tuple(q for q in self.gradable if answers.get(q.number) != q.answer)
+        return QuizResult(len(self.gradable) - len(wrong), len(self.gradable), wrong)
+
+
+def _text(value):
+    text = str(value).strip() if not pd.isna(value) else ""
+    return "" if text.lower() == "nan" else text
+
+
+def _resolve_answer(key, options):
+    """หาว่าเฉลยในชีตคือตัวเลือกไหน: ตรงทั้งข้อความ > ตัวอักษร A-D (หรือ "ตัวเลือก A") > มีข้อความซ้อนกันแค่ตัวเลือกเดียว
+    (แบบหลังสุดคือวิธีเทียบเดิม เก็บไว้ให้ชีตเก่าที่พิมพ์เฉลยไม่ครบยังใช้ได้ แต่ต้องไม่กำกวม)"""
+    if not key:
+        return None
+    folded = [option.casefold() for option in options]
+    if key.casefold() in folded:
+        return folded.index(key.casefold())
+    letter = key.replace("ตัวเลือก", "").strip().upper()
+    if len(letter) == 1 and "A" <= letter < chr(ord("A") + len(options)):
+        return ord(letter) - ord("A")
+    partial = [i for i, option in enumerate(folded) if key.casefold() in option or option in key.casefold()]
+    return partial[0] if len(partial) == 1 else None
+
+
+@st.cache_resource(max_entries=2)
+def build_answer_key(quiz_version, _df_quiz):
+    """คำถาม/ตัวเลือก/เฉลยของทุกข้อ เตรียมครั้งเดียวต่อ version ของชีต (ใช้ร่วมทุก session)"""
+    questions = []
+    for number, (_, row) in enumerate(_df_quiz.iterrows(), start=1):
+        question = _text(row.get('คำถาม', ''))
+        if not question:
+            continue
+        options = tuple(opt for opt in (_text(row.get(col, '')) for col in QUIZ_OPTION_COLUMNS) if opt)
+        answer = _resolve_answer(_text(row.get('เฉลย', '')), options)
+        questions.append(QuizQuestion(number, question, options, answer,
+                                      options[answer] if answer is not None else "",
+                                      _text(row.get('คำอธิบาย (ถ้าตอบผิด)', ''))))
+    digest = hashlib.sha1(repr([(q.question, q.options, q.answer) for q in questions]).encode("utf-8")).hexdigest()
+    return AnswerKey(f"Q{digest[:8]}", tuple(questions))  # ขึ้นต้นด้วยตัวอักษร กัน Google Sheet แปลงเป็นตัวเลข
+
+
+def score_row(username, key, result, timestamp):
+    """แถวที่จะต่อท้ายแผ่น Quiz_Scores (เรียงตาม QUIZ_SCORE_COLUMNS)"""
+    return [timestamp, username, key.quiz_id, result.score, result.total,
+            ", ".join(str(q.number) for q in result.wrong)]
+
+
+@st.cache_resource(max_entries=4)
+def summarize_scores(scores_version, _df_scores, quiz_id=None):
+    """สรุปคะแนนรายคน (ทำกี่ครั้ง, ล่าสุด, สูงสุด, เฉลี่ย เป็น %) - quiz_id=None คือรวมทุกชุดข้อสอบ"""
+    df = _df_scores
+    if not set(QUIZ_SCORE_COLUMNS[:5]) <= set(df.columns):
+        return pd.DataFrame(columns=["ชื่อ", "ทำไปแล้ว (ครั้ง)", "ล่าสุด (%)", "สูงสุด (%)", "เฉลี่ย (%)", "ทำล่าสุดเมื่อ"])
+    if quiz_id is not None:
+        df = df[df["ชุดข้อสอบ"] == quiz_id]
+    df = df[df["ชื่อ"].notna() & (df["คะแนนเต็ม"] > 0)]
+    df = df.assign(percent=100.0 * df["คะแนน"] / df["คะแนนเต็ม"]).sort_values("เวลา", kind="stable")
+    grouped = df.groupby("ชื่อ")
+    summary = pd.DataFrame({
+        "ทำไปแล้ว (ครั้ง)": grouped.size(),
+        "ล่าสุด (%)": grouped["percent"].last().round(1),
+        "สูงสุด (%)": grouped["percent"].max().round(1),
+        "เฉลี่ย (%)": grouped["percent"].mean().round(1),
+        "ทำล่าสุดเมื่อ": grouped["เวลา"].last(),
+    })
+    return summary.sort_values(["สูงสุด (%)", "เฉลี่ย (%)"], ascending=False).reset_index()
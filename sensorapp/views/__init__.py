@@ -0,0 +1,76 @@
+"""ทะเบียนเมนู: แต่ละเมนูอยู่ในโมดูลของตัวเอง (มีฟังก์ชัน render())
+โมดูลของเมนูและ dependency หนักๆ ของมัน (folium, plotly, ...) ถูก import ตอนมีคนเปิดเมนูนั้นครั้งแรก แล้วค้างอยู่ใน process
+คนที่เปิดแค่คู่มือหรือศูนย์การเรียนรู้จึงไม่ต้องรอโหลดแผนที่/กราฟ"""
+import importlib
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from sensorapp.metrics import get_metrics
+
+STAFF = ("admin", "member")
+
+
+@dataclass(frozen=True)
+class Page:
+    label: str          # ข้อความในเมนู sidebar
+    module: str         # ชื่อโมดูลใน sensorapp.views
+    roles: tuple = None  # None = ทุกระดับสิทธิ์เห็น
+
+
+PAGES = [
+    Page("🏠 1. ภาพรวมและสถิติ (Dashboard)", "dashboard"),
+    Page("🏢 2. เจาะลึกรายไซต์ (Site Detail)", "site_detail"),
+    Page("📱 3. กระดานงานส่วนตัว (My Workload)", "my_workload", STAFF),
+    Page("📊 4. ภาพรวมงานของทีม (Team Manager)", "team_manager", STAFF),
+    Page("🧰 5. ระบบเบิก-คืนอุปกรณ์ (Tools)", "tools", STAFF),
+    Page("👥 6. ข้อมูลทีม (Team Profile)", "team_profile", STAFF),
+    Page("🧠 7. ศูนย์การเรียนรู้ (Learning & Quiz)", "learning", STAFF),
+    Page("📚 8. คู่มือการใช้งาน (Manuals & Docs)", "manuals"),
+    Page("🩺 9. ตรวจสุขภาพระบบ (Diagnostics)", "diagnostics", ("admin",)),
+]
+
+_import_lock = threading.Lock()
+_import_report = {}  # ชื่อ -> {"seconds", "packages", "at"} ของการ import ครั้งแรกใน process นี้
+
+
+def pages_for(role):
+    """เมนูที่สิทธิ์ระดับนี้เห็น (ตามลำดับใน PAGES)"""
+    return [page for page in PAGES if page.roles is None or role in page.roles]
+
+
+def _record_import(name, seconds, packages):
+    _import_report[name] = {"seconds": seconds, "packages": packages, "at": time.time()}
+    get_metrics().observe("import_seconds", seconds, module=name)
+
+
+def record_startup_import(seconds):
+    """app.py เรียกทุกรอบ แต่จดแค่รอบแรกของ process (รอบถัดไป import หยิบจาก sys.modules ไม่มีความหมาย)"""
+    with _import_lock:
+        if "(startup)" not in _import_report:
+            _record_import("(startup)", seconds, [])
+
+
+def load_page(page):
+    """คืนโมดูลของเมนู - import ครั้งแรกจับเวลาและจดว่าดึงแพ็กเกจอะไรเข้ามาเพิ่มบ้าง"""
+    name = f"{__name__}.{page.module}"
+    if name in sys.modules and page.module in _import_report:
+        return importlib.import_module(name)
+    with _import_lock:
+        before = set(sys.modules)
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        seconds = time.perf_counter() - started
+        if page.module not in _import_report or name not in before:
+            # นับเฉพาะแพ็กเกจภายนอก (folium, plotly, ...) ที่เพิ่งถูกโหลดเพราะเมนูนี้
+            packages = sorted({m.split(".")[0] for m in set(sys.modules) - before} - {"sensorapp"})
+            _record_import(page.module, seconds, [p for p in packages if not p.startswith("_")])
+    return module
+
+
+def import_report():
+    """[(ชื่อ, วินาที, แพ็กเกจที่โหลดเพิ่ม, เวลาที่ import)] เรียงตามลำดับที่เกิดขึ้น"""
+    with _import_lock:
+        items = sorted(_import_report.items(), key=lambda item: item[1]["at"])
+    return [(name, info["seconds"], info["packages"], info["at"]) for name, info in items]
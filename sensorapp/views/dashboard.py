@@ -0,0 +1,114 @@
+"""🏠 1. ภาพรวมและสถิติ (Dashboard)"""
+
+import datetime
+import html
+
+import folium
+from folium.plugins import FastMarkerCluster
+import streamlit as st
+import streamlit.components.v1 as components
+
+from sensorapp.compute import build_pm_schedule, build_workload, THAI_MONTHS
+from sensorapp.data import load_sheets, sheet_version
+from sensorapp.metrics import get_metrics
+from sensorapp.widgets import paginated_table
+
+
+# หมุดทุกไซต์อยู่ใน layer เดียว (FastMarkerCluster) ให้ browser สร้างหมุดเองจาก array -> HTML เล็กลงมาก
+SITE_MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({markerColor: row[3], icon: 'info-sign', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+
+def site_map_points(df_master, df_schedule):
+    """[lat, long, ชื่อไซต์, สี] ของทุกไซต์ที่มีพิกัด (สีตามสถานะ PM, ไซต์ที่ไม่อยู่ใน PM_Plan เป็นสีเทา)"""
+    sites = df_master.dropna(subset=['ละติจูด (Latitude)', 'ลองจิจูด (Longitude)'])
+    names = sites['ชื่อไซต์งาน (Process Work)'].astype(str)
+    colors = names.map(dict(zip(df_schedule["ชื่อไซต์งาน"], df_schedule["สี"]))).fillna("gray")
+    return [list(p) for p in zip(sites['ละติจูด (Latitude)'].tolist(), sites['ลองจิจูด (Longitude)'].tolist(),
+                                 names.map(html.escape).tolist(), colors.tolist())]
+
+
+@st.cache_data(max_entries=8)
+def build_site_map_html(master_version, pm_version, cur_year, cur_month, _df_master, _df_schedule):
+    """HTML ของแผนที่ทั้งหน้า สร้างครั้งเดียวต่อ version ของ Master_Site + PM_Plan (+ เดือน เพราะสีหมุดขึ้นกับเดือน)
+    เก็บเป็นข้อความ ไม่ใช่ตัว folium.Map -> ทุก session ได้สำเนาของตัวเอง และ rerun ไม่ต้อง serialize แผนที่ใหม่"""
+    m = folium.Map(location=[13.73, 100.52], zoom_start=6)
+    FastMarkerCluster(site_map_points(_df_master, _df_schedule), callback=SITE_MARKER_CALLBACK).add_to(m)
+    return m.get_root().render()
+
+
+def render():
+    st.title("📊 ศูนย์บัญชาการทีม Sensor (Command Center)")
+    st.write("ภาพรวมสรุปข้อมูล แผนที่ และสถานะ PM อัจฉริยะแบบ Real-time")
+    st.markdown("---")
+
+    try:
+        # 1. โหลดข้อมูลพื้นฐาน
+        df_pm, df_task, df_master = load_sheets(["PM_Plan", "Task & Workload", "Master_Site"])
+
+        # 📅 ระบบเวลา Real-time
+        now = datetime.datetime.now()
+        cur_m_name = THAI_MONTHS[now.month - 1]
+
+        # 2. สรุปตัวเลข KPI
+        # นับจำนวนไซต์จาก Master_Site เพื่อความแม่นยำ
+        total_sites_count = len(df_master['ชื่อไซต์งาน (Process Work)'].dropna().unique()) if 'ชื่อไซต์งาน (Process Work)' in df_master.columns else 0
+        active_tasks = build_workload(sheet_version("Task & Workload"), df_task).total_active
+
+        c1, c2, c3 = st.columns(3)
+        c1.metric("🏢 จำนวนไซต์งานทั้งหมด", f"{total_sites_count} ไซต์")
+        c2.metric("📋 งานที่กำลังทำ", f"{active_tasks} งาน")
+        c3.metric("📅 เดือนปัจจุบัน", cur_m_name)
+
+        # 🧠 Logic วิเคราะห์สีและสถานะ (คำนวณครั้งเดียวต่อ version ของ PM_Plan ต่อเดือน)
+        with get_metrics().timer("section_seconds", section="dashboard_pm_schedule"):
+            df_schedule = build_pm_schedule(df_pm, sheet_version("PM_Plan"), now.year, now.month)
+        df_status = df_schedule.drop(columns=["สี"])
+
+        # 🌟 เพิ่มส่วนแสดงรายชื่อไซต์งานทั้งหมดที่มี
+        with st.expander(f"📂 รายชื่อไซต์งานทั้งหมด ({total_sites_count} ไซต์)"):
+            if not df_master.empty:
+                paginated_table(df_master[['ชื่อไซต์งาน (Process Work)']], "dashboard_sites", page_size=25, hide_index=True)
+            else:
+                st.info("ไม่มีข้อมูลใน Master_Site")
+
+        # 🧩 กดเปลี่ยนตัวกรอง -> rerun แค่ตัวกรอง + ตาราง (แผนที่และ KPI ด้านบนไม่ต้องสร้างใหม่)
+        @st.fragment
+        def pm_status_table():
+            # 🔍 ปุ่ม Filter Real-time
+            st.markdown("### 🔍 เลือกดูสถานะตามกำหนดการ PM")
+            filter_choice = st.radio("คัดกรองไซต์งาน:", 
+                                     ["แสดงทั้งหมด", "🔴 ผ่านมาแล้ว (เลยกำหนด)", "🟠 เดือนนี้ (ต้องเข้าทำ)", "🟡 เดือนหน้า (เตรียมตัว)", "🟢 PM เรียบร้อยแล้ว / ยังไม่ถึงรอบ"], 
+                                     horizontal=True)
+
+            # ตารางสถานะที่กรองแล้ว
+            df_filtered = df_status
+            if filter_choice != "แสดงทั้งหมด":
+                df_filtered = df_status[df_status['สถานะ'] == filter_choice]
+
+            st.markdown("### 🗓️ ตารางติดตามสถานะ PM")
+            st.dataframe(df_filtered.sort_values(by="สถานะ"), use_container_width=True, hide_index=True)
+
+        # 🧩 แผนที่แยกเป็น fragment ของตัวเอง: การกดที่ส่วนอื่นของหน้าไม่ต้องส่งแผนที่ไปเบราว์เซอร์ใหม่
+        @st.fragment
+        def site_map():
+            st.markdown("### 🗺️ แผนที่พิกัดไซต์งาน (สีหมุดตามสถานะ PM)")
+            if not df_master.empty and 'ละติจูด (Latitude)' in df_master.columns:
+                with get_metrics().timer("section_seconds", section="dashboard_map_build"):
+                    map_html = build_site_map_html(sheet_version("Master_Site"), sheet_version("PM_Plan"),
+                                                   now.year, now.month, df_master, df_schedule)
+                # แผนที่แสดงอย่างเดียว ไม่ส่งค่ากลับ -> ซูม/เลื่อนแผนที่ไม่สั่ง rerun และ HTML เดิมไม่ถูกส่งไปเบราว์เซอร์ซ้ำ
+                with get_metrics().timer("section_seconds", section="dashboard_map_render"):
+                    components.html(map_html, height=400)
+
+        pm_status_table()
+        site_map()
+
+    except Exception as e: 
+        st.warning(f"ระบบกำลังโหลดข้อมูล... ({e})")
@@ -0,0 +1,80 @@
+"""🩺 9. ตรวจสุขภาพระบบ (Diagnostics)"""
+
+import time
+
+import pandas as pd
+import streamlit as st
+
+from sensorapp.data import get_sheet_fetcher, get_sheet_hub, OUTBOX_PATH
+from sensorapp.metrics import get_metrics
+from sensorapp.monitoring import metrics_gauges, METRICS_PORT
+from sensorapp.notify import get_line_dispatcher
+from sensorapp.views import import_report
+
+
+def render():
+    st.title("🩺 ตรวจสุขภาพระบบ (Diagnostics)")
+    st.write("เวลาที่ใช้และตัวนับของ process นี้ (นับตั้งแต่เซิร์ฟเวอร์เริ่มทำงาน รวมทุกผู้ใช้)")
+    st.markdown("---")
+
+    metrics = get_metrics()
+    timing_rows = [
+        {"ตัววัด": name, "label": ", ".join(f"{k}={v}" for k, v in labels.items()), "ครั้ง": count,
+         "p50 (ms)": round(p50 * 1000, 1), "p95 (ms)": round(p95 * 1000, 1), "max (ms)": round(worst * 1000, 1),
+         "รวม (s)": round(total, 2)}
+        for name, labels, count, total, p50, p95, worst in metrics.timings()
+    ]
+    st.markdown("### ⏱️ เวลาที่ใช้ (render / ดึงข้อมูล / GAS / LINE)")
+    if timing_rows:
+        st.dataframe(pd.DataFrame(timing_rows), use_container_width=True, hide_index=True)
+    else:
+        st.caption("ยังไม่มีข้อมูล")
+
+    st.markdown("### 🔢 ตัวนับ (cache hit/miss, bytes, ผลการส่ง)")
+    counter_rows = [{"ตัวนับ": name, "label": ", ".join(f"{k}={v}" for k, v in labels.items()), "ค่า": value}
+                    for name, labels, value in metrics.counters()]
+    if counter_rows:
+        st.dataframe(pd.DataFrame(counter_rows), use_container_width=True, hide_index=True)
+    else:
+        st.caption("ยังไม่มีข้อมูล")
+
+    # coalesced คือจำนวนครั้งที่รอผลร่วมกันแทนการยิงซ้ำไปหา Google
+    st.markdown("### 📥 สถานะชีตและการดึงข้อมูลจาก Google")
+    fetch_stats = get_sheet_fetcher().stats()
+    hub_status = get_sheet_hub().status()
+    if fetch_stats or hub_status:
+        df_fetch_stats = pd.DataFrame.from_dict(fetch_stats, orient="index")
+        df_hub_status = pd.DataFrame.from_dict(hub_status, orient="index")
+        st.dataframe(df_hub_status.join(df_fetch_stats, how="outer"), use_container_width=True)
+    else:
+        st.caption("ยังไม่มีการดึงข้อมูล")
+
+    st.markdown("### 📮 คิวเขียน GAS และ 📨 LINE")
+    line_dispatcher = get_line_dispatcher()
+    st.caption(f"📨 LINE: {line_dispatcher.stats() or 'ยังไม่มีการส่ง'}")
+    if line_dispatcher.last_error:
+        st.caption(f"ล่าสุด: {line_dispatcher.last_error}")
+    outbox_counts, outbox_error = get_sheet_hub().outbox.stats()
+    st.caption(f"📮 คิวเขียน GAS: {outbox_counts or 'ว่าง'}")
+    if outbox_counts.get("failed"):
+        st.error(f"มี {outbox_counts['failed']} รายการส่งเข้า GAS ไม่สำเร็จ (ดูในไฟล์ {OUTBOX_PATH})")
+    if outbox_counts.get("lost"):
+        st.error(f"มี {outbox_counts['lost']} รายการที่ GAS ตอบรับแต่ไม่พบในชีตจริง (ดูในไฟล์ {OUTBOX_PATH})")
+    if outbox_error:
+        st.caption(f"ล่าสุด: {outbox_error}")
+
+    # 📦 (startup) = import โค้ดส่วนกลางตอนเปิด process, ที่เหลือ = เมนูที่ถูกเปิดครั้งแรก (โหลดแพ็กเกจอะไรเพิ่มบ้าง)
+    st.markdown("### 📦 เวลา import ครั้งแรก (cold start)")
+    import_rows = [
+        {"โมดูล": name, "ms": round(seconds * 1000, 1), "แพ็กเกจที่โหลดเพิ่ม": ", ".join(packages) or "-",
+         "เมื่อ": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(at))}
+        for name, seconds, packages, at in import_report()
+    ]
+    st.dataframe(pd.DataFrame(import_rows), use_container_width=True, hide_index=True)
+
+    with st.expander("📄 ข้อความ /metrics (Prometheus)"):
+        if METRICS_PORT:
+            st.caption(f"เปิดให้ดึงได้ที่พอร์ต {METRICS_PORT} path /metrics")
+        else:
+            st.caption("ตั้ง METRICS_PORT ใน secrets เพื่อเปิดให้ Prometheus ดึงค่าเหล่านี้ได้โดยตรง")
+        st.code(metrics.to_prometheus(metrics_gauges()), language="text")
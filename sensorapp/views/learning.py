@@ -0,0 +1,199 @@
+"""🧠 7. ศูนย์การเรียนรู้ (Learning & Quiz)"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from sensorapp.data import append_rows_to_gas, load_sheet, sheet_version
+from sensorapp.formulas import FormulaError, compile_calc_tools, evaluate_table
+from sensorapp.quiz import QUIZ_SCORES_SHEET, build_answer_key, score_row, summarize_scores
+from sensorapp.widgets import paginated_dataframe
+
+
+def render():
+    CURRENT_USER = st.session_state.get('username', 'ไม่ระบุตัวตน')
+    st.title("🧠 ศูนย์การเรียนรู้ และเครื่องมือคำนวณ")
+    st.write("คลังความรู้ แบบทดสอบ และเครื่องมือคำนวณที่อัปเดตจาก Google Sheets โดยตรง")
+    
+    # สร้าง 3 แท็บ
+    tab1, tab2, tab3 = st.tabs(["📚 คลังความรู้ (Knowledge)", "📝 แบบทดสอบ (Quiz)", "🧮 เครื่องมือคำนวณอัจฉริยะ"])
+    
+# --- Tab 1: คลังความรู้ (ดึงจาก Learning_Content) ---
+    with tab1:
+        st.markdown("### 📚 คลังความรู้และคู่มือสูตรคำนวณ")
+        try:
+            df_learning = load_sheet("Learning_Content")
+            
+            if not df_learning.empty and 'ชื่อหัวข้อ' in df_learning.columns:
+                for index, row in df_learning.iterrows():
+                    category = str(row.get('หมวดหมู่', 'ทั่วไป'))
+                    topic = str(row.get('ชื่อหัวข้อ', ''))
+                    
+                    # 🌟 เปลี่ยนมาใช้ \n\n แทนการใช้ <br> เพื่อให้กล่องของ Streamlit แสดงผลได้สวยงาม
+                    formula = str(row.get('สูตรการคำนวณ', ''))
+                    info = str(row.get('ข้อมูลการคำนวณ', '')).replace('\n', '\n\n')
+                    example = str(row.get('ตัวอย่างการคำนวณ', '')).replace('\n', '\n\n')
+                    
+                    if topic and topic.lower() != 'nan':
+                        with st.expander(f"📖 [{category}] {topic}"):
+                            
+                            # กล่องไฮไลท์สูตรคำนวณ (สีฟ้า)
+                            if formula and formula.lower() != 'nan' and formula != '-':
+                                st.info(f"**💡 สูตรการคำนวณ:**\n\n### {formula}")
+                                
+                            # ส่วนอธิบายข้อมูล 
+                            if info and info.lower() != 'nan' and info != '-':
+                                st.markdown(f"**📝 ข้อมูลและคำอธิบาย:**\n\n{info}")
+                                
+                            # กล่องไฮไลท์ตัวอย่าง (สีเขียว)
+                            if example and example.lower() != 'nan' and example != '-':
+                                st.success(f"**🔢 ตัวอย่างการคำนวณ:**\n\n{example}", icon="✅")
+            else:
+                st.info("ยังไม่มีข้อมูล หรือรอการเปลี่ยนหัวคอลัมน์เป็น 'ชื่อหัวข้อ' ในแผ่น Learning_Content ครับ")
+        except Exception as e:
+            st.error(f"ไม่สามารถโหลด Learning_Content ได้: {e}")
+    # --- Tab 2: แบบทดสอบ (ดึงจาก Quiz_Data) ---
+    with tab2:
+        try:
+            df_quiz = load_sheet("Quiz_Data")
+            
+            if not df_quiz.empty and 'คำถาม' in df_quiz.columns:
+                st.markdown("### 📝 ทดสอบความรู้ประจำสัปดาห์")
+                # เฉลยของทั้งชุดเตรียมไว้ครั้งเดียวต่อ version ของชีต (ใช้ร่วมทุก session)
+                key = build_answer_key(sheet_version("Quiz_Data"), df_quiz)
+                
+                # 📋 ทั้งชุดอยู่ในฟอร์มเดียว: เลือกคำตอบได้เรื่อยๆ โดยไม่ rerun แล้วตรวจทุกข้อตอนกดส่งครั้งเดียว
+                with st.form("quiz_form"):
+                    answers = {}
+                    for q in key.questions:
+                        st.markdown(f"**ข้อที่ {q.number}: {q.question}**")
+                        if q.options:
+                            answers[q.number] = st.radio(f"เลือกคำตอบข้อ {q.number}:", range(len(q.options)), index=None,
+                                                         format_func=q.options.__getitem__, key=f"quiz_{key.quiz_id}_{q.number}")
+                        st.markdown("---")
+                    submitted = st.form_submit_button("📨 ส่งคำตอบทั้งหมด", type="primary", use_container_width=True)
+                
+                if submitted:
+                    result = key.grade(answers)
+                    timestamp = (pd.Timestamp.utcnow() + pd.Timedelta(hours=7)).strftime("%Y-%m-%d %H:%M:%S")
+                    try:
+                        # คะแนนทั้งชุดเป็น 1 แถว ลงคิวในเครื่องแล้วไปต่อได้เลย (ระบบเบื้องหลังส่งเข้า GAS ให้)
+                        saved = append_rows_to_gas(QUIZ_SCORES_SHEET, [score_row(CURRENT_USER, key, result, timestamp)])
+                    except Exception as e:
+                        saved = False
+                        st.error(f"บันทึกคะแนนไม่สำเร็จ: {e}")
+                    st.session_state['quiz_result'] = (key.quiz_id, result, saved)
+                
+                # ผลการส่งครั้งล่าสุดของชุดนี้ (ยังโชว์อยู่แม้สลับแท็บ/เมนูแล้วกลับมา)
+                last = st.session_state.get('quiz_result')
+                if last and last[0] == key.quiz_id:
+                    _, result, saved = last
+                    st.markdown(f"<h3 style='text-align: center; color: #008080;'>ได้ {result.score} / {result.total} คะแนน ({result.percent:.0f}%)</h3>", unsafe_allow_html=True)
+                    if saved:
+                        st.caption("💾 บันทึกคะแนนแล้ว")
+                    if not result.wrong:
+                        st.success("✅ ถูกทุกข้อครับ! เยี่ยมมาก")
+                    for q in result.wrong:
+                        picked = answers.get(q.number) if submitted else None
+                        with st.expander(f"❌ ข้อที่ {q.number}: {q.question}"):
+                            if picked is not None:
+                                st.write(f"คุณตอบ: {q.options[picked]}")
+                            st.write(f"เฉลยคือ: **{q.answer_text}**")
+                            if q.explain:
+                                st.info(f"💡 **ทำไมถึงผิด?:** {q.explain}")
+                
+                unkeyed = [str(q.number) for q in key.questions if q.answer is None]
+                if unkeyed:
+                    st.caption(f"⚠️ ข้อ {', '.join(unkeyed)} ไม่นับคะแนน เพราะ 'เฉลย' ใน GSheet ไม่ตรงกับตัวเลือกใดเลย")
+                
+                # 🏆 สรุปคะแนนรายคน
+                st.markdown("### 🏆 สรุปคะแนนของทีม")
+                try:
+                    df_scores = load_sheet(QUIZ_SCORES_SHEET)
+                    only_this_set = st.toggle("เฉพาะข้อสอบชุดปัจจุบัน", value=True)
+                    summary = summarize_scores(sheet_version(QUIZ_SCORES_SHEET), df_scores,
+                                               key.quiz_id if only_this_set else None)
+                    if summary.empty:
+                        st.info("ยังไม่มีใครส่งคำตอบครับ")
+                    else:
+                        st.dataframe(summary, use_container_width=True, hide_index=True)
+                except Exception as e:
+                    st.info(f"ยังไม่มีแผ่น {QUIZ_SCORES_SHEET} สำหรับเก็บคะแนนครับ ({e})")
+            else:
+                st.info("ยังไม่มีข้อสอบในแผ่น Quiz_Data ครับ")
+        except Exception as e:
+            st.error(f"ไม่สามารถโหลด Quiz_Data ได้: {e}")
+
+    # --- Tab 3: เครื่องมือคำนวณ (ดึงจากแผ่น Calc_Tools) ---
+    with tab3:
+        st.markdown("### 🧮 เครื่องมือคำนวณอัจฉริยะ (ไม่จำกัดจำนวนตัวแปร)")
+        st.write("ระบบจะสร้างช่องกรอกข้อมูลและคำนวณอัตโนมัติ ตามสูตรที่คุณตั้งไว้ใน Google Sheets")
+        
+        try:
+            df_calc = load_sheet("Calc_Tools")
+            
+            if not df_calc.empty and 'ชื่อสูตร' in df_calc.columns:
+                # สูตรทุกข้อถูกแปลง+ตรวจ+compile ครั้งเดียวต่อ version ของชีต (ใช้ร่วมทุก session)
+                formulas = compile_calc_tools(sheet_version("Calc_Tools"), df_calc)
+                formula_list = list(formulas)
+                
+                # 🧩 เครื่องคิดเลขเป็น fragment: เปลี่ยนสูตร/พิมพ์ตัวเลข/กดคำนวณ rerun แค่ส่วนนี้ (แท็บอื่นไม่ต้องวาดใหม่)
+                @st.fragment
+                def formula_calculator():
+                    selected_form = st.selectbox("📌 เลือกสูตรที่ต้องการคำนวณ:", formula_list)
+                    formula = formulas[selected_form]
+                
+                    if formula.description:
+                        st.info(f"💡 **หลักการคำนวณ:** {formula.description}")
+                    
+                    if not formula.variables:
+                        st.warning("⚠️ ยังไม่ได้กำหนดชื่อตัวแปรใน GSheet ครับ")
+                        return
+                    if not formula.equation:
+                        st.warning("⚠️ ยังไม่ได้กำหนดสมการใน GSheet ครับ")
+                        return
+                    if formula.error:
+                        st.error(f"❌ สมการใน GSheet ใช้ไม่ได้: {formula.error}")
+                        return
+                    
+                    # สร้างกล่องรับค่าแบบอัตโนมัติ
+                    input_values = {}
+                    cols = st.columns(2)
+                    for i, var in enumerate(formula.variables):
+                        with cols[i % 2]:
+                            input_values[var] = st.number_input(f"🔢 ค่าของ {var}", value=0.0, step=0.1, key=f"var_{var}")
+                        
+                    if st.button("🧮 คำนวณผลลัพธ์", type="primary"):
+                        result = float(formula.evaluate(input_values))
+                        if np.isfinite(result):
+                            st.markdown(f"<h3 style='text-align: center; color: #008080; padding: 20px; border: 2px dashed #008080; border-radius: 10px;'>ผลลัพธ์ = {result:,.2f} {formula.unit}</h3>", unsafe_allow_html=True)
+                        else:
+                            st.error("❌ คำนวณไม่ได้ด้วยค่าชุดนี้ (เช่น หารด้วยศูนย์ หรือถอดรากของค่าติดลบ)")
+
+                    # 📂 คำนวณทีละหลายแถว: อัปโหลด CSV ที่มีคอลัมน์ชื่อเดียวกับตัวแปร -> คำนวณทั้งไฟล์ในรอบเดียว
+                    with st.expander("📂 คำนวณจากไฟล์ CSV (หลายแถวพร้อมกัน)"):
+                        st.caption(f"ไฟล์ต้องมีคอลัมน์: {', '.join(formula.variables)} (คอลัมน์อื่นจะติดไปในผลลัพธ์ด้วย)")
+                        uploaded = st.file_uploader("เลือกไฟล์ CSV", type="csv", key=f"calc_csv_{selected_form}")
+                        if uploaded is not None:
+                            try:
+                                df_input = pd.read_csv(uploaded)
+                                df_input.columns = [str(c).strip() for c in df_input.columns]
+                                result_col = f"ผลลัพธ์ ({formula.unit})" if formula.unit else "ผลลัพธ์"
+                                df_input[result_col] = evaluate_table(formula, df_input)
+                            except (FormulaError, ValueError, UnicodeDecodeError) as e:
+                                st.error(f"❌ อ่านไฟล์ไม่ได้: {e}")
+                            else:
+                                n_bad = int((~np.isfinite(df_input[result_col])).sum())
+                                st.success(f"✅ คำนวณแล้ว {len(df_input):,} แถว" + (f" (คำนวณไม่ได้ {n_bad:,} แถว เพราะค่าว่าง/ไม่ใช่ตัวเลข/หารด้วยศูนย์)" if n_bad else ""))
+                                paginated_dataframe(df_input, key="calc_batch", use_container_width=True, hide_index=True)
+                                st.download_button("⬇️ ดาวน์โหลดผลลัพธ์ (CSV)", df_input.to_csv(index=False).encode("utf-8-sig"),
+                                                   file_name=f"{selected_form}_ผลลัพธ์.csv", mime="text/csv")
+
+                if formula_list:
+                    formula_calculator()
+                else:
+                    st.info("ยังไม่มีรายชื่อสูตรครับ")
+            else:
+                st.warning("⚠️ โปรดตรวจสอบว่าแผ่น 'Calc_Tools' มีคอลัมน์ชื่อ 'ชื่อสูตร', 'ชื่อตัวแปร' และ 'สมการ' ครบถ้วนครับ")
+        except Exception as e:
+            st.warning("ระบบกำลังรอตาราง Calc_Tools จาก Google Sheets ครับ...")
@@ -0,0 +1,49 @@
+"""📚 8. คู่มือการใช้งาน (Manuals & Docs)"""
+
+import streamlit as st
+
+from sensorapp.data import load_sheet
+
+
+def render():
+    st.title("📚 คู่มือการใช้งานและเอกสาร (Manuals & Docs)")
+    st.write("ศูนย์รวมโฟลเดอร์คู่มือการติดตั้ง Wiring Diagram และเอกสารมาตรฐานของทีม Sensor")
+    st.markdown("---")
+
+    try:
+        df_docs = load_sheet("Manual_Docs")
+
+        if not df_docs.empty and 'หมวดหมู่' in df_docs.columns:
+            for _, row in df_docs.iterrows():
+                cat_name = str(row.get('หมวดหมู่', ''))
+                desc = str(row.get('รายละเอียด', '-'))
+                
+                # 🌟 จุดที่อัปเกรด 1: ใช้ .strip() เพื่อลบช่องว่าง (Spacebar) ที่อาจเผลอกดตอนวางลิงก์
+                link = str(row.get('ลิงก์โฟลเดอร์', '')).strip() 
+
+                if cat_name and cat_name.lower() != 'nan':
+                    with st.container():
+                        col1, col2 = st.columns([3, 1])
+                        with col1:
+                            st.markdown(f"### 📂 {cat_name}")
+                            if desc and desc.lower() != 'nan' and desc != '-':
+                                st.write(f"ℹ️ {desc}")
+                        with col2:
+                            st.markdown("<br>", unsafe_allow_html=True) 
+                            
+                            # 🌟 จุดที่อัปเกรด 2: แค่มีตัวอักษรเกิน 5 ตัว ก็ถือว่าเป็นลิงก์แล้ว
+                            if link and link.lower() != 'nan' and len(link) > 5:
+                                
+                                # 🌟 จุดที่อัปเกรด 3: ถ้าลิงก์ที่วางมาไม่มี http:// ระบบจะเติมให้อัตโนมัติ!
+                                if not link.startswith('http'):
+                                    link = 'https://' + link
+                                    
+                                st.markdown(f"<a href='{link}' target='_blank'><button style='width:100%; padding:10px; background-color:#008080; color:white; border:none; border-radius:5px; cursor:pointer; font-weight:bold; font-size:16px;'>🔗 เปิดโฟลเดอร์</button></a>", unsafe_allow_html=True)
+                            else:
+                                st.write("*(ยังไม่มีลิงก์โฟลเดอร์)*")
+                        st.divider()
+        else:
+            st.info("💡 กรุณาสร้างแผ่น 'Manual_Docs' ใน GSheet และใส่คอลัมน์ 'หมวดหมู่', 'รายละเอียด', 'ลิงก์โฟลเดอร์'")
+            
+    except Exception as e:
+        st.warning(f"ระบบกำลังรอการเชื่อมต่อกับแผ่น 'Manual_Docs' ใน Google Sheets ครับ")
@@ -0,0 +1,129 @@
+"""📱 3. กระดานงานส่วนตัว (My Workload)"""
+
+import pandas as pd
+import streamlit as st
+
+from sensorapp.compute import build_workload
+from sensorapp.data import load_sheet, sheet_version, submit_gas_write
+
+
+def render():
+    st.title("📱 กระดานงานส่วนตัว")
+    
+    # 1. กำหนดชื่อผู้ใช้งานปัจจุบัน (ดึงจากระบบ Login)
+    # 🌟 อัปเดตให้ใช้ชื่อจาก Session ที่ล็อกอินเข้ามาแทนแบบ Fix ค่าเดิม
+    CURRENT_USER = st.session_state.get('username', 'ไม่ระบุตัวตน')
+    st.info(f"👤 สวัสดีครับคุณ **{CURRENT_USER}** นี่คืองานที่อยู่ในความรับผิดชอบของคุณครับ")
+
+    # 2. --- ส่วนแสดงตารางงานของตัวเอง (คงของเดิมไว้ 100%) ---
+    try:
+        # งานที่เราเป็นผู้รับผิดชอบหลักหรือผู้ช่วย - หาจากดัชนี คน<->งาน ที่ใช้ร่วมกันทั้งทีม
+        # (ชื่อต้องตรงทั้งคำ ไม่ใช่ contains ที่ทำให้ "Film" ไปเห็นงานของ "Filmy")
+        display_cols = ['วันที่เข้าทำ (Scheduled Date)', 'ชื่อไซต์งาน', 'ชื่องาน / รายละเอียด', 'ประเภทงาน', 'สถานะงาน', 'ผู้ช่วย']
+        df_tasks = load_sheet("Task & Workload")
+        workload = build_workload(sheet_version("Task & Workload"), df_tasks)
+        available_cols = [col for col in display_cols if col in df_tasks.columns]
+        my_tasks = df_tasks.loc[workload.task_ids(CURRENT_USER), available_cols]
+
+        if not my_tasks.empty:
+            st.markdown("### 📋 รายการงานของคุณ")
+            st.dataframe(my_tasks, use_container_width=True, hide_index=True)
+        else:
+            st.success("🎉 ตอนนี้คุณไม่มีงานค้างเลยครับ พักผ่อนได้!")
+
+    except KeyError as e:
+        st.error(f"⚠️ หาหัวคอลัมน์ {e} ในตาราง Task & Workload ไม่เจอครับ")
+    except Exception as e:
+        st.error(f"ระบบขัดข้อง: {e}")
+    
+    # 3. --- ส่วนฟอร์มกรอกงานด่วน (อัปเกรด Dropdown & อื่นๆ) ---
+    st.markdown("### ➕ ฟอร์มแจ้งงานด่วน / อัปเดตงาน")
+    
+    # ดึงรายชื่อทีม
+    team_members = ["Heart", "Phubeth", "Mink", "Film", "Folk", "Chan"]
+    
+    # 🌟 ดึงรายชื่อไซต์งานทั้งหมดมาทำ Dropdown
+    try:
+        df_master_m3 = load_sheet("Master_Site")
+        site_list_m3 = df_master_m3['ชื่อไซต์งาน (Process Work)'].dropna().unique().tolist()
+    except:
+        site_list_m3 = []
+        
+    # เติมตัวเลือก "อื่นๆ" ไว้ล่างสุด
+    site_options_m3 = site_list_m3 + ["➕ อื่นๆ (ระบุเอง)"]
+
+    # 🧩 ฟอร์มเป็น fragment: พิมพ์/เลือกค่าในฟอร์มจะ rerun แค่ฟอร์มนี้ (ไม่โหลดตารางงานและ sidebar ใหม่)
+    # กดบันทึกสำเร็จแล้วค่อยสั่ง st.rerun() ทั้งหน้า ให้ตารางงานด้านบนเห็นงานใหม่
+    @st.fragment
+    def quick_task_form():
+        # 🌟 ใช้ st.container แทน st.form เพื่อให้โชว์ช่องพิมพ์ "อื่นๆ" ได้แบบ Real-time
+        with st.container(border=True):
+            col1, col2 = st.columns(2)
+        
+            with col1:
+                # Dropdown เลือกไซต์งาน
+                selected_site_m3 = st.selectbox("ชื่อไซต์งาน", site_options_m3)
+            
+                # ถ้าเลือกอื่นๆ ให้มีช่องพิมพ์โผล่มา
+                if selected_site_m3 == "➕ อื่นๆ (ระบุเอง)":
+                    final_site_name = st.text_input("ระบุชื่อไซต์งานใหม่:", placeholder="พิมพ์ชื่อไซต์ที่นี่...")
+                else:
+                    final_site_name = selected_site_m3
+                
+                task_detail = st.text_input("ชื่องาน / รายละเอียด", placeholder="เช่น เข้าไปเปลี่ยนซิมเร้าเตอร์")
+                task_type = st.selectbox("ประเภทงาน", ["งานด่วน", "งานตามแพลน", "งานโปรเจกต์"])
+                status = st.selectbox("สถานะงาน", ["Planning", "In progress", "Problem", "Complete"])
+            
+            with col2:
+                start_date = st.date_input("วันที่เข้าทำ (Scheduled Date)")
+                end_date = st.date_input("กำหนดเสร็จ (Deadline)")
+            
+                # 🌟 ให้ Default ผู้รับผิดชอบ เป็นชื่อคนที่ล็อกอินอยู่เลย (เพื่อความรวดเร็ว)
+                default_assignee_idx = team_members.index(CURRENT_USER) if CURRENT_USER in team_members else 0
+                assignee = st.selectbox("ผู้รับผิดชอบหลัก", team_members, index=default_assignee_idx)
+            
+                assistants = st.multiselect("ผู้ช่วย (ถ้ามี)", team_members)
+            
+            st.markdown("<br>", unsafe_allow_html=True)
+            # เปลี่ยนเป็น st.button ธรรมดา (เพราะไม่ได้ใช้ st.form แล้ว)
+            submitted = st.button("บันทึกข้อมูลลงตาราง", type="primary", use_container_width=True)
+        
+            if submitted:
+                if final_site_name and task_detail:
+                    assistants_str = ", ".join(assistants)
+                    payload = {
+                        "sheet": "Task & Workload",
+                        "data": [
+                            (pd.Timestamp.utcnow() + pd.Timedelta(hours=7)).strftime("%Y-%m-%d %H:%M:%S"),
+                            final_site_name, task_detail, task_type, 
+                            start_date.strftime("%d/%m/%Y"), end_date.strftime("%d/%m/%Y"), 
+                            status, assignee, assistants_str
+                        ]
+                    }
+                    with st.spinner("กำลังส่งข้อมูลเข้าตาราง..."):
+                        try:
+                            # บันทึกลงคิวในเครื่องแล้วไปต่อได้เลย ระบบเบื้องหลังส่งเข้า GAS ให้ (ส่งไม่ผ่านจะลองใหม่เอง)
+                            # แจ้งกลุ่ม LINE ตอนที่ GAS บันทึกลงตารางสำเร็จแล้วเท่านั้น (บันทึกไม่สำเร็จ = ไม่แจ้ง)
+                            line_message = (
+                                f"🔔 งานใหม่เข้าระบบ!\n"
+                                f"━━━━━━━━━━━━━\n"
+                                f"👤 ผู้แจ้ง: {CURRENT_USER}\n"
+                                f"🏢 ไซต์: {final_site_name}\n"
+                                f"📋 งาน: {task_detail}\n"
+                                f"🏷️ ประเภท: {task_type}\n"
+                                f"📌 สถานะ: {status}\n"
+                                f"📅 วันเข้าทำ: {start_date.strftime('%d/%m/%Y')}\n"
+                                f"⏰ กำหนดเสร็จ: {end_date.strftime('%d/%m/%Y')}\n"
+                                f"👷 ผู้รับผิดชอบ: {assignee}\n"
+                                f"🤝 ผู้ช่วย: {assistants_str if assistants_str else '-'}"
+                            )
+                            if submit_gas_write(payload, notify=line_message):
+                                st.success(f"บันทึกงาน '{task_detail}' ที่ '{final_site_name}' แล้ว! 🎉 "
+                                           "จะแจ้งเข้ากลุ่ม LINE ให้เมื่อลงตารางเรียบร้อย")
+                                st.rerun()
+                        except Exception as e:
+                            st.error(f"ระบบขัดข้อง: {e}")
+                else:
+                    st.warning("⚠️ กรุณากรอก 'ชื่อไซต์งาน' และ 'รายละเอียดงาน' ให้ครบถ้วนครับ")
+
+    quick_task_form()
@@ -0,0 +1,157 @@
+"""🏢 2. เจาะลึกรายไซต์ (Site Detail)"""
+
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from sensorapp.compute import build_pm_schedule, group_rows_by_site
+from sensorapp.data import load_sheet, load_sheets, sheet_version, submit_gas_write
+from sensorapp.widgets import paginated_table
+
+
+def render():
+    st.title("🏢 เจาะลึกข้อมูลรายไซต์ (Site Detail)")
+
+    try:
+        # โหลดข้อมูล Master Site เพื่อดึงรายชื่อไซต์
+        df_master = load_sheet("Master_Site")
+        site_list = df_master['ชื่อไซต์งาน (Process Work)'].dropna().unique().tolist()
+        
+        # ตรวจสอบการนำทางมาจากหน้า Dashboard (ถ้ามี)
+        default_index = 0
+        if 'selected_site_from_dashboard' in st.session_state:
+            requested_site = st.session_state.selected_site_from_dashboard
+            if requested_site in site_list:
+                default_index = site_list.index(requested_site) + 1
+            del st.session_state.selected_site_from_dashboard
+
+        site_options = ["🌐 ดูแผน PM รวมทุกไซต์ (All Sites)"] + site_list
+        selected_site = st.selectbox("🔍 ค้นหาหรือเลือกไซต์งานที่ต้องการดูข้อมูล:", site_options, index=default_index)
+        
+        st.markdown("---")
+        
+        if selected_site == "🌐 ดูแผน PM รวมทุกไซต์ (All Sites)":
+            st.subheader("🌐 ภาพรวมตารางแผน PM ทุกไซต์งานประจำปี")
+            try:
+                df_pm_all = load_sheet("PM_Plan")
+                paginated_table(df_pm_all, "pm_all_sites", sort_by='ชื่อไซต์งาน', use_container_width=True, hide_index=True)
+                st.info("💡 เลื่อนแถบด้านล่างตารางไปทางขวา เพื่อดูเดือนอื่นๆ ได้เลยครับ")
+            except Exception as e:
+                st.error(f"ไม่สามารถโหลดข้อมูลแผน PM รวมได้: {e}")
+                
+        else:
+            st.subheader(f"📍 ข้อมูลสรุปของไซต์: {selected_site}")
+            tab1, tab2, tab3 = st.tabs(["🗓️ แผน PM (PM Plan)", "📡 อุปกรณ์ (Assets)", "🚨 ประวัติปัญหา (Issue Log)"])
+
+            # โหลดทุกชีตที่ 3 แท็บต้องใช้พร้อมกันรอบเดียว (แต่ละแท็บจัดการ error ของตัวเองเหมือนเดิม)
+            df_pm_site, df_tasks_site = load_sheets(["PM_Plan", "Task & Workload"], return_exceptions=True)
+            
+            # ดัชนีรายไซต์ของแต่ละชีต (สร้างครั้งเดียวต่อ version) -> เลือกไซต์ไหนก็แค่ lookup
+            pm_by_site = tasks_by_site = None
+            if not isinstance(df_pm_site, Exception):
+                pm_by_site = group_rows_by_site("PM_Plan", sheet_version("PM_Plan"), df_pm_site)
+            if not isinstance(df_tasks_site, Exception):
+                tasks_by_site = group_rows_by_site("Task & Workload", sheet_version("Task & Workload"), df_tasks_site)
+
+            # --- Tab 1: แผน PM (PM ใหญ่ + PM ย่อย 1-3) ---
+            with tab1:
+                try:
+                    if isinstance(df_pm_site, Exception): raise df_pm_site
+                    if pm_by_site is None: raise KeyError('ชื่อไซต์งาน')
+                    site_pm = pm_by_site.get(selected_site)
+
+                    if site_pm is not None:
+                        row_data = site_pm.iloc[0]
+                        pm_done_status = str(row_data.get('สถานะ PM', '')).strip()
+                        
+                        # กรองเอาเฉพาะรอบการ PM 4 ครั้งตามเงื่อนไข
+                        pm_cols = ['PM ใหญ่', 'PM ย่อย ครั้งที่ 1', 'PM ย่อย ครั้งที่ 2', 'PM ย่อย ครั้งที่ 3']
+                        pm_schedule = []
+                        for col in pm_cols:
+                            if col in site_pm.columns:
+                                val = str(row_data[col]).strip()
+                                if val and val.lower() != 'nan' and val != '-':
+                                    pm_schedule.append({"รอบการทำงาน": col, "กำหนดการ": val})
+                        
+                        st.success(f"📌 กำหนดการ PM ของ {selected_site}")
+                        
+                        # สถานะรอบนี้จาก engine ตัวเดียวกับหน้า Dashboard (cache ไว้ตาม version ของ PM_Plan)
+                        today = datetime.date.today()
+                        df_schedule = build_pm_schedule(df_pm_site, sheet_version("PM_Plan"), today.year, today.month)
+                        schedule_by_site = group_rows_by_site("PM_schedule", f"{sheet_version('PM_Plan')}@{today:%Y-%m}", df_schedule)
+                        site_status = schedule_by_site.get(selected_site)
+                        if site_status is not None:
+                            st.markdown(f"**สถานะรอบนี้:** {site_status.iloc[0]['สถานะ']} (กำหนดการ: {site_status.iloc[0]['กำหนดการ']})")
+                        if pm_schedule:
+                            st.table(pd.DataFrame(pm_schedule))
+                        
+                        # แยกบรรทัดที่ 5: วันที่ซิมหมดอายุ
+                        if 'วันที่ซิมหมดอายุ' in site_pm.columns:
+                            sim_date = str(row_data['วันที่ซิมหมดอายุ']).strip()
+                            if sim_date and sim_date.lower() != 'nan' and sim_date != '-':
+                                st.warning(f"📶 **วันที่ซิมหมดอายุ:** {sim_date}")
+
+                        st.markdown("---")
+                        
+                        # ระบบปุ่มบันทึกสถานะ PM
+                        if pm_done_status == "PM แล้ว":
+                            st.info("✅ ไซต์นี้บันทึกว่าทำ PM เสร็จเรียบร้อยแล้ว")
+                            if st.button(f"↩️ ยกเลิกสถานะ PM ของ {selected_site}", type="secondary"):
+                                payload = {"action": "update_pm_status", "sheet": "PM_Plan", "siteName": selected_site, "status": ""}
+                                submit_gas_write(payload)
+                                st.rerun()
+                        else:
+                            if st.button(f"✅ บันทึกว่า {selected_site} ทำ PM รอบนี้เสร็จแล้ว", type="primary"):
+                                payload = {"action": "update_pm_status", "sheet": "PM_Plan", "siteName": selected_site, "status": "PM แล้ว"}
+                                submit_gas_write(payload)
+                                st.rerun()
+                    else:
+                        st.info("ไม่พบข้อมูลแผนงานของไซต์นี้ใน PM_Plan")
+                except Exception as e:
+                    st.error(f"เกิดข้อผิดพลาดในหน้า PM Plan: {e}")
+                    
+            # --- Tab 2: อุปกรณ์ที่ติดตั้ง (Assets) ---
+            with tab2:
+                try:
+                    # ดึงมาเฉพาะอุปกรณ์ของไซต์นี้ (Google กรองให้ ไม่ต้องโหลด Asset_Sensor ทั้งแผ่น)
+                    # schema หาคอลัมน์ไซต์งานแบบยืดหยุ่นแล้วเปลี่ยนชื่อเป็น 'ชื่อไซต์งาน' ให้ตั้งแต่ตอนโหลด
+                    site_assets = load_sheet("Asset_Sensor", filters=[('ชื่อไซต์งาน', "==", selected_site)])
+                    if not site_assets.empty:
+                        st.dataframe(site_assets.drop(columns=['ชื่อไซต์งาน']), use_container_width=True, hide_index=True)
+                    else:
+                        st.info(f"ไม่พบข้อมูลอุปกรณ์ของไซต์ {selected_site} ในแผ่น Asset_Sensor")
+                except KeyError:
+                    st.warning("⚠️ ตาราง Asset_Sensor ไม่มีคอลัมน์ 'ชื่อไซต์งาน'")
+                except Exception as e:
+                    st.warning(f"ยังไม่สามารถดึงข้อมูลจากแผ่น Asset_Sensor ได้: {e}")
+                    
+            # --- Tab 3: ประวัติปัญหา (Issue Log) ---
+            with tab3:
+                has_log = False
+                # 1. ดึง "หมายเหตุ" จาก PM_Plan มาแสดงก่อน
+                try:
+                    site_row = pm_by_site.get(selected_site)
+                    if site_row is not None and 'หมายเหตุ' in site_row.columns:
+                        note = str(site_row.iloc[0]['หมายเหตุ']).strip()
+                        if note and note.lower() != 'nan' and note != '-':
+                            st.info(f"📝 **หมายเหตุจากแผนงาน:**\n\n{note}")
+                            st.markdown("---")
+                            has_log = True
+                except: pass
+
+                # 2. ดึงประวัติจาก Task & Workload
+                try:
+                    site_tasks = tasks_by_site.get(selected_site)
+                    if site_tasks is not None:
+                        st.markdown("🔍 **ประวัติการทำงานและปัญหา:**")
+                        st.dataframe(site_tasks.drop(columns=['ชื่อไซต์งาน']), use_container_width=True, hide_index=True)
+                        has_log = True
+                except: pass
+
+                # 3. ถ้าไม่มีทั้งคู่ค่อยโชว์ 🎉
+                if not has_log:
+                    st.success("🎉 ยังไม่เคยพบปัญหาร้ายแรงในไซต์นี้")
+
+    except Exception as e:
+        st.error(f"เกิดข้อผิดพลาดที่เมนู 2: {e}")
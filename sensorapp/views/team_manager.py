@@ -0,0 +1,84 @@
+"""📊 4. ภาพรวมงานของทีม (Team Manager)"""
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from sensorapp.compute import build_workload
+from sensorapp.data import load_sheet, sheet_version
+from sensorapp.widgets import paginated_dataframe
+
+
+def render():
+    st.title("📊 ภาพรวมงานของทีม (Team Workload)")
+    st.write("ศูนย์บัญชาการสำหรับดูภาระงานของทุกคนในทีม เพื่อประกอบการตัดสินใจจ่ายงาน")
+    
+    try:
+        df_tasks = load_sheet("Task & Workload")
+        
+        if not df_tasks.empty:
+            # นับ/จับคู่ คน<->งาน ครั้งเดียวต่อ version ของชีตงาน ใช้ทั้งกราฟและตัวกรองด้านล่าง
+            workload = build_workload(sheet_version("Task & Workload"), df_tasks)
+            
+            # --- 📈 ส่วนที่ 1: กราฟสรุปภาระงาน (Workload) ---
+            st.markdown("### 📈 ภาระงานรายบุคคล (เฉพาะงานหลักที่รับผิดชอบ)")
+            
+            if 'ผู้รับผิดชอบหลัก' in df_tasks.columns:
+                # นับจำนวนงานที่ยังไม่ Complete ของแต่ละคน (เฉพาะงานที่เป็นผู้รับผิดชอบหลัก)
+                by_owner = workload.active_by_person("lead")
+                workload_count = pd.DataFrame(list(by_owner.items()), columns=['ชื่อทีมงาน', 'จำนวนงาน (ชิ้น)'])
+                
+                # วาดกราฟแท่งด้วย Plotly
+                fig = px.bar(
+                    workload_count, 
+                    x='ชื่อทีมงาน', 
+                    y='จำนวนงาน (ชิ้น)', 
+                    text='จำนวนงาน (ชิ้น)',
+                    color='ชื่อทีมงาน',
+                    title="จำนวนงานที่ค้างอยู่ของแต่ละคน (Active Tasks)"
+                )
+                fig.update_traces(textposition='outside') # ให้ตัวเลขอยู่บนแท่งกราฟ
+                st.plotly_chart(fig, use_container_width=True)
+            
+            st.markdown("---")
+            
+            # --- 📋 ส่วนที่ 2: ตารางรวมงานทั้งหมด (พร้อมระบบ Filter) ---
+            st.markdown("### 📋 ตารางติดตามงานของทีม (Team Task Tracker)")
+            
+            # 🧩 ตัวกรอง + ตารางเป็น fragment เดียวกัน: เปลี่ยนตัวกรอง/เลื่อนหน้าไม่ต้องวาดกราฟด้านบนใหม่
+            @st.fragment
+            def team_task_tracker():
+                # สร้างตัวกรองข้อมูล (Filter)
+                col1, col2 = st.columns(2)
+                with col1:
+                    filter_status = st.multiselect(
+                        "📌 กรองตามสถานะ:", 
+                        ["Planning", "In progress", "Problem", "Complete"], 
+                        default=["Planning", "In progress", "Problem"] # ค่าเริ่มต้นไม่โชว์งาน Complete
+                    )
+                with col2:
+                    filter_person = st.selectbox(
+                        "👤 ดูเฉพาะงานของ:", 
+                        ["ดูทุกคน"] + ["Heart", "Phubeth", "Mink", "Film", "Folk", "Chan"]
+                    )
+            
+                # ทำการกรองข้อมูลตามที่ผู้ใช้เลือก
+                filtered_df = df_tasks.copy()
+                if filter_status:
+                    filtered_df = filtered_df[filtered_df['สถานะงาน'].isin(filter_status)]
+                
+                if filter_person != "ดูทุกคน":
+                    # เป็นหลักหรือผู้ช่วย (ชื่อตรงทั้งคำ)
+                    filtered_df = filtered_df[filtered_df.index.isin(workload.task_ids(filter_person))]
+            
+                # แสดงตารางผลลัพธ์ (งานที่บันทึกล่าสุดขึ้นก่อน)
+                paginated_dataframe(filtered_df, "team_tracker", sort_by='Timestamp', ascending=False,
+                                    use_container_width=True, hide_index=True)
+
+            team_task_tracker()
+            
+        else:
+            st.info("ยังไม่มีข้อมูลงานในระบบครับ")
+            
+    except Exception as e:
+        st.error(f"เกิดข้อผิดพลาดในการโหลดตารางงาน: {e}")
@@ -0,0 +1,64 @@
+"""👥 6. ข้อมูลทีม (Team Profile)"""
+
+import streamlit as st
+
+from sensorapp.compute import build_workload
+from sensorapp.data import load_sheet, sheet_version
+
+
+def render():
+    st.title("👥 ข้อมูลและศักยภาพทีม (Team Profile)")
+    st.write("ทำเนียบสมาชิกทีม Sensor เพื่อดูความรับผิดชอบ ความเชี่ยวชาญ และใบรับรองของแต่ละบุคคล")
+    
+    try:
+        df_team = load_sheet("Team_Profile")
+        
+        if not df_team.empty and 'ชื่อ' in df_team.columns:
+            st.markdown("---")
+            col1, col2 = st.columns(2)
+            
+            try:
+                # นับงานค้างของทุกคนจากภาระงานรวมของทีม (ชุดเดียวกับ Dashboard / Team Manager)
+                # (ต้องโหลดชีตก่อนถาม sheet_version ไม่งั้นยังไม่มี snapshot ของรอบนี้ให้อ้าง)
+                df_tasks = load_sheet("Task & Workload")
+                workload = build_workload(sheet_version("Task & Workload"), df_tasks)
+                active_as_lead = workload.active_by_person("lead")
+                active_as_assistant = workload.active_by_person("assistant")
+            except Exception as e:
+                workload = None  # โหลดตารางงานไม่ได้ -> ไม่ต้องโชว์สถานะงาน แต่บอกให้รู้ว่าเพราะอะไร
+                st.warning(f"⚠️ โหลดสถานะงานจาก Task & Workload ไม่ได้: {e}")
+            
+            for i, row in df_team.iterrows():
+                name = str(row.get('ชื่อ', 'ไม่ระบุ')).strip()
+                role = str(row.get('ตำแหน่ง', '-'))
+                skill = str(row.get('ความเชี่ยวชาญ', '-'))
+                tel = str(row.get('เบอร์ติดต่อ', '-'))
+                # 🌟 เปลี่ยนมารับค่าจากคอลัมน์ 'ใบเซอร์' แทน
+                cert = str(row.get('ใบเซอร์', '-'))
+                
+                if name and name.lower() != 'nan':
+                    with col1 if i % 2 == 0 else col2:
+                        st.info(f"### 👨‍🔧 คุณ {name}") # ใส่ไอคอนช่างเป็นค่าเริ่มต้นแทน
+                        st.markdown(f"**ตำแหน่ง:** {role}")
+                        st.markdown(f"**ความเชี่ยวชาญ:** {skill}")
+                        st.markdown(f"**ใบรับรอง (Certificate):** {cert}") # โชว์ใบเซอร์ตรงนี้
+                        st.markdown(f"**เบอร์ติดต่อ:** {tel}")
+                        
+                        if workload is not None:
+                            task_count = active_as_lead.get(name, 0)
+                            helper_count = active_as_assistant.get(name, 0)
+                            
+                            if task_count > 0:
+                                st.error(f"📌 **สถานะ:** มีงานค้างอยู่ {task_count} โปรเจกต์"
+                                         + (f" (และช่วยงานอื่นอีก {helper_count} งาน)" if helper_count else ""))
+                            elif helper_count > 0:
+                                st.warning(f"🤝 **สถานะ:** ไม่มีงานหลักค้าง แต่กำลังช่วยงานอยู่ {helper_count} งาน")
+                            else:
+                                st.success("✨ **สถานะ:** ตอนนี้เคลียร์งานครบ 100% แล้ว!")
+                                
+                        st.markdown("<br>", unsafe_allow_html=True)
+        else:
+            st.warning("⚠️ แผ่น 'Team_Profile' ยังไม่มีข้อมูล หรือยังไม่มีคอลัมน์ที่ชื่อว่า 'ชื่อ' ครับ")
+            
+    except Exception as e:
+        st.error(f"เกิดข้อผิดพลาดในการโหลด Team_Profile: {e}")
@@ -0,0 +1,126 @@
+"""🧰 5. ระบบเบิก-คืนอุปกรณ์ (Tools)"""
+
+import pandas as pd
+import streamlit as st
+
+from sensorapp.compute import compute_inventory
+from sensorapp.data import append_rows_to_gas, load_sheet, load_sheets, sheet_version
+from sensorapp.widgets import paginated_table
+
+
+def render():
+    st.title("🧰 ระบบเบิก-คืนอุปกรณ์ส่วนกลาง")
+    st.write("บันทึกประวัติ พร้อมระบบนับสต๊อกและคำนวณของคงเหลืออัตโนมัติ")
+    
+    # 1. ดึงข้อมูลรายชื่อไซต์และทีมงาน
+    try:
+        df_master = load_sheet("Master_Site")
+        site_list = df_master['ชื่อไซต์งาน (Process Work)'].dropna().tolist()
+    except:
+        site_list = ["ไม่ระบุ / โชว์รูม"]
+    team_members = ["Heart", "Phubeth", "Mink", "Film", "Folk", "Chan"]
+    
+    # 2. 🧮 ระบบคำนวณสต๊อกคงเหลือ (Inventory Engine)
+    df_stock = pd.DataFrame(columns=["อุปกรณ์", "ทั้งหมด", "ถูกยืม", "คงเหลือ"])
+    df_holdings = pd.DataFrame(columns=["ผู้ถือ", "อุปกรณ์", "จำนวน", "ไซต์ล่าสุด"])
+    
+    try:
+        # โหลดคลังหลัก (Master_Equipment) + ประวัติการยืม (Team_Tools) เพื่อหาของที่หายไปจากคลัง
+        df_equip, df_tools = load_sheets(["Master_Equipment", "Team_Tools"])
+        # คำนวณใหม่เฉพาะตอนที่ข้อมูลคลังหรือประวัติเปลี่ยนจริงๆ (และนับต่อเฉพาะแถวประวัติที่เพิ่มเข้ามาใหม่)
+        df_stock, df_holdings = compute_inventory(
+            df_equip, df_tools, sheet_version("Master_Equipment"), sheet_version("Team_Tools")
+        )
+    except Exception as e:
+        st.warning(f"ระบบกำลังรอข้อมูลคลังสินค้า: {e}")
+
+    # 3. เตรียมตัวเลือก Dropdown พร้อมแสดงยอดคงเหลือ
+    tool_options_display = []
+    real_tool_names = {}
+    
+    for tool, total, remaining in df_stock[df_stock["ทั้งหมด"] > 0][["อุปกรณ์", "ทั้งหมด", "คงเหลือ"]].itertuples(index=False):
+        display_text = f"{tool} (เหลือ {remaining}/{total})"
+        tool_options_display.append(display_text)
+        real_tool_names[display_text] = tool
+
+    # --- ส่วนที่ 1: ฟอร์มเบิก/คืน ---
+    st.markdown("### 📝 ฟอร์มทำรายการ")
+    # 🧩 ฟอร์มเป็น fragment (เดิมเป็น st.form ช่องจำนวนจึงไม่โผล่จนกว่าจะกดส่ง):
+    # เลือกอุปกรณ์/ปรับจำนวน rerun แค่ฟอร์มนี้ ไม่ต้องคำนวณสต๊อกและวาดตารางประวัติใหม่
+    @st.fragment
+    def tools_form():
+        with st.container(border=True):
+            col1, col2 = st.columns(2)
+            with col2:
+                status = st.radio("📌 สถานะการทำรายการ", ["🔴 ยืมอุปกรณ์ (Borrow)", "🟢 คืนอุปกรณ์ (Return)"], horizontal=True)
+                site_used = st.selectbox("📍 นำไปใช้ที่ไซต์งาน", ["ส่วนกลาง / ออฟฟิศ"] + site_list)
+            
+            with col1:
+                borrower = st.selectbox("👤 ชื่อผู้เบิก/คืน", team_members)
+                selected_displays = st.multiselect("🔧 เลือกอุปกรณ์ (กดเลือกได้หลายชิ้น)", tool_options_display)
+        
+            # 📦 สร้างช่องกรอกจำนวน โผล่ขึ้นมาตามของที่กดเลือก!
+            quantities = {}
+            if selected_displays:
+                st.markdown("**📦 ระบุจำนวนที่ต้องการทำรายการ:**")
+                col_q1, col_q2 = st.columns(2)
+                for i, display in enumerate(selected_displays):
+                    tool = real_tool_names[display]
+                    # สลับฝั่งซ้ายขวาให้ดูสวยงาม
+                    with col_q1 if i % 2 == 0 else col_q2:
+                        quantities[tool] = st.number_input(f"จำนวน: {tool}", min_value=1, step=1, key=f"qty_{tool}")
+            
+            submitted = st.button("บันทึกข้อมูลเข้าคลัง", type="primary")
+        
+            if submitted:
+                if selected_displays:
+                    with st.spinner("กำลังบันทึกข้อมูลเข้าคลัง..."):
+                        # รวมทุกอุปกรณ์ในรายการนี้เป็นก้อนเดียว ยิง GAS ครั้งเดียว (ได้ทั้งหมดหรือไม่ได้เลย)
+                        timestamp = (pd.Timestamp.utcnow() + pd.Timedelta(hours=7)).strftime("%Y-%m-%d %H:%M:%S")
+                        rows = []
+                        for display in selected_displays:
+                            tool = real_tool_names[display]
+                            rows.append([
+                                timestamp, borrower, tool, site_used,
+                                status.replace("🔴 ", "").replace("🟢 ", ""),
+                                quantities[tool] # คอลัมน์ F: จำนวน
+                            ])
+                        try:
+                            saved = append_rows_to_gas("Team_Tools", rows)
+                        except Exception as e:
+                            saved = False
+                            st.error(f"ระบบขัดข้อง: {e}")
+                    
+                        if saved:
+                            st.success(f"✅ บันทึก '{status}' จำนวน {len(rows)} รายการ เรียบร้อยแล้ว! (รีเฟรชเพื่อดูยอดคงเหลืออัปเดต)")
+                else:
+                    st.warning("⚠️ กรุณาเลือกอุปกรณ์ที่ต้องการทำรายการก่อนครับ")
+    
+    tools_form()
+
+    st.markdown("---")
+    
+    # --- ส่วนที่ 2: ใครถืออุปกรณ์อะไรอยู่ที่ไซต์ไหน ---
+    st.markdown("### 👷 อุปกรณ์ที่ยังไม่ได้คืน (แยกตามผู้ถือ)")
+    if not df_holdings.empty:
+        col_h1, col_h2 = st.columns([2, 1])
+        with col_h1:
+            st.dataframe(df_holdings.sort_values(["ผู้ถือ", "อุปกรณ์"]), use_container_width=True, hide_index=True)
+        with col_h2:
+            by_site = df_holdings.groupby(df_holdings["ไซต์ล่าสุด"].fillna("ไม่ระบุ"))["จำนวน"].sum().reset_index()
+            by_site.columns = ["ไซต์งาน", "จำนวนชิ้น"]
+            st.dataframe(by_site, use_container_width=True, hide_index=True)
+    else:
+        st.success("✨ ตอนนี้อุปกรณ์ทุกชิ้นอยู่ในคลังครบแล้ว")
+
+    st.markdown("---")
+
+    # --- ส่วนที่ 3: ตารางประวัติการเบิก-คืน ---
+    st.markdown("### 📋 ประวัติการยืม-คืนล่าสุด")
+    try:
+        df_tools = load_sheet("Team_Tools")
+        if not df_tools.empty:
+            paginated_table(df_tools, "tools_history", sort_by='วันที่บันทึก', ascending=False,
+                            use_container_width=True, hide_index=True)
+    except:
+        st.info("ยังไม่มีประวัติการเบิกใช้อุปกรณ์ในระบบครับ")
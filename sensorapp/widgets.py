@@ -0,0 +1,40 @@
+"""ส่วนประกอบหน้าเว็บที่ใช้ซ้ำหลายเมนู"""
+import numpy as np
+import streamlit as st
+
+# 📄 --- ตารางแบบแบ่งหน้า (ค้นหา/เรียงก่อน แล้วส่งไปเบราว์เซอร์แค่หน้าที่ดูอยู่) --- 📄
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+def paginated_dataframe(df, key, sort_by=None, ascending=True, page_size=50, **dataframe_kwargs):
+    """แสดง DataFrame ทีละหน้า: ช่องค้นหา (ทุกคอลัมน์ข้อความ) + เลือกคอลัมน์ที่ใช้เรียง + เลื่อนหน้า
+    sort_by/ascending คือค่าเริ่มต้นของการเรียง (ตารางประวัติใช้ "ล่าสุดขึ้นก่อน")"""
+    col_search, col_sort, col_order, col_size = st.columns([3, 2, 1, 1])
+    search = col_search.text_input("🔎 ค้นหา", key=f"{key}_search", placeholder="พิมพ์คำที่ต้องการค้นหา...")
+    columns = list(df.columns)
+    sort_col = col_sort.selectbox("เรียงตาม", columns, key=f"{key}_sort",
+                                  index=columns.index(sort_by) if sort_by in columns else 0)
+    descending = col_order.toggle("มาก→น้อย", value=not ascending, key=f"{key}_desc")
+    size = col_size.selectbox("ต่อหน้า", PAGE_SIZES, key=f"{key}_size",
+                              index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1)
+
+    if search:
+        text_cols = df.select_dtypes(include=["object", "string"]).columns
+        masks = [df[c].str.contains(search, case=False, regex=False, na=False) for c in text_cols]
+        df = df[np.logical_or.reduce(masks)] if masks else df.iloc[0:0]
+    if sort_col in df.columns:
+        df = df.sort_values(sort_col, ascending=not descending, kind="stable", na_position="last")
+
+    pages = max(1, -(-len(df) // size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages  # ค้นหาแล้วแถวน้อยลง -> เด้งกลับมาหน้าสุดท้ายที่มีจริง
+    page = st.number_input(f"หน้า (ทั้งหมด {pages} หน้า)", min_value=1, max_value=pages, step=1, key=page_key)
+    start = (page - 1) * size
+    st.dataframe(df.iloc[start:start + size], **dataframe_kwargs)
+    st.caption(f"แสดงแถวที่ {min(start + 1, len(df))}–{min(start + size, len(df))} จากทั้งหมด {len(df)} แถว")
+
+
+# 🧩 ตัวเดียวกันแต่เป็น fragment: ค้นหา/เรียง/เลื่อนหน้า rerun แค่ตารางนี้ ไม่ต้องรันทั้งหน้าใหม่
+# (ใช้ paginated_dataframe ตัวปกติเมื่อถูกเรียกจากใน fragment อื่นอยู่แล้ว)
+paginated_table = st.fragment(paginated_dataframe)
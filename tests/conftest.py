@@ -0,0 +1,16 @@
+"""ตั้ง secrets ปลอมก่อน import sensorapp (data.py อ่าน GAS_URL / SHEET_URL ตอน import)"""
+import os
+import sys
+import tempfile
+
+from streamlit import config
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_workdir = tempfile.mkdtemp(prefix="sensorapp-tests-")
+_secrets = os.path.join(_workdir, "secrets.toml")
+with open(_secrets, "w", encoding="utf-8") as f:
+    f.write('GAS_URL = "http://127.0.0.1:9/gas"\n')
+    f.write('SHEET_URL = "http://127.0.0.1:9/spreadsheets/d/TEST/edit"\n')
+    f.write(f'OUTBOX_PATH = "{os.path.join(_workdir, "outbox.sqlite3")}"\n')
+config.set_option("secrets.files", [_secrets])
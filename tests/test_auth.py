@@ -0,0 +1,69 @@
+import hmac
+import logging
+
+import pandas as pd
+
+from sensorapp import auth
+from sensorapp.auth import AuthIndex, SessionStore, check_password_strength
+
+
+def test_session_token_round_trip_and_revoke():
+    store = SessionStore(b"secret", ttl=60)
+    token = store.issue("Film", "admin")
+    assert store.verify(token) == ("Film", "admin")
+    assert store.verify(token.replace(".", ".x", 1)) is None
+    store.revoke(token)
+    assert store.verify(token) is None
+
+
+def test_expired_sessions_are_evicted_on_next_issue():
+    store = SessionStore(b"secret", ttl=60)
+    stale = [store.issue(f"user{i}", "member") for i in range(5)]
+    store._ttl = -1  # ทำให้ทุก session ที่ออกต่อจากนี้หมดอายุทันที
+    expired = store.issue("ghost", "member")
+    store._ttl = 60
+    store.issue("Mink", "member")
+    assert len(store) == 6  # 5 คนเดิม + Mink (ghost ถูกล้างทิ้งแล้ว)
+    assert all(store.verify(token) for token in stale)
+    assert store.verify(expired) is None
+
+
+def test_check_password_strength_returns_every_problem():
+    assert len(check_password_strength("abc")) == 3  # สั้น, ไม่มีตัวเลข, ไม่มีอักขระพิเศษ
+    assert check_password_strength("sensor-2025") == []
+
+
+def _users(*rows):
+    return pd.DataFrame(rows, columns=["Username", "Password", "Status", "Role"])
+
+
+def test_auth_index_hashes_only_the_user_who_logs_in(monkeypatch):
+    hashed = []
+    real_hash = auth._hash_password
+    monkeypatch.setattr(auth, "_hash_password", lambda password, salt: hashed.append(password) or real_hash(password, salt))
+    index = AuthIndex(_users(["Film", "pw-film", "Approved", "admin"], ["Mink", "pw-mink", "Approved", "member"]))
+    assert hashed == []  # สร้างดัชนีแล้วยังไม่ hash ใครเลย
+
+    (credential,) = index.credentials("Mink")
+    assert hashed == ["pw-mink"]
+    assert credential.role == "member"
+    assert index.credentials("Mink") == (credential,)  # ครั้งต่อไปใช้ hash เดิม
+    assert hashed == ["pw-mink"]
+    assert index.credentials("Nobody") == ()
+
+
+def test_duplicate_usernames_are_logged_and_the_matching_row_wins(caplog):
+    with caplog.at_level(logging.WARNING, logger="sensorapp.auth"):
+        index = AuthIndex(_users(["Film", "old-pw", "Pending", "member"], ["Film ", "new-pw", "Approved", "admin"]))
+    assert "Film" in caplog.text
+
+    first, second = index.credentials("Film")
+    assert hmac.compare_digest(auth._hash_password("new-pw", second.salt), second.password_hash)
+    assert (first.status, second.status) == ("Pending", "Approved")
+
+
+def test_verify_rejects_non_ascii_signatures():
+    store = SessionStore(b"secret", ttl=60)
+    session_id = store.issue("Film", "admin").partition(".")[0]
+    assert store.verify(f"{session_id}.ลายเซ็นปลอม") is None
+    assert store.verify("ไซต์.abc") is None
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from sensorapp.compute import PM_BUCKETS, InventoryLedger, build_pm_schedule
+
+COLUMNS = ["วันที่บันทึก", "ผู้เบิก/คืน", "อุปกรณ์", "ไซต์งาน", "สถานะ", "จำนวน"]
+
+
+def _tools(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_ledger_counts_only_appended_rows():
+    ledger = InventoryLedger()
+    rows = [["d1", "Film", "Drill", "A", "ยืม", 2.0], ["d2", "Film", "Drill", "A", "คืน", 1.0]]
+    held, _ = ledger.update(_tools(rows))
+    assert held[("Film", "Drill")] == 1.0
+    held, last_site = ledger.update(_tools(rows + [["d3", "Film", "Drill", "B", "ยืม", 3.0]]))
+    assert held[("Film", "Drill")] == 4.0
+    assert last_site[("Film", "Drill")] == "B"
+
+
+def test_ledger_recounts_when_an_earlier_row_is_edited():
+    ledger = InventoryLedger()
+    rows = [["d1", "Film", "Drill", "A", "ยืม", 2.0], ["d2", "Mink", "Meter", "A", "ยืม", 1.0],
+            ["d3", "Film", "Drill", "A", "คืน", 1.0]]
+    ledger.update(_tools(rows))
+    rows[0][5] = 5.0  # แก้จำนวนในแถวแรก (ไม่ใช่แถวสุดท้าย)
+    held, _ = ledger.update(_tools(rows))
+    assert held[("Film", "Drill")] == 4.0
+    assert held[("Mink", "Meter")] == 1.0
+
+
+def _pm(*rounds):
+    return pd.DataFrame({"ชื่อไซต์งาน": [f"S{i}" for i in range(len(rounds))], "PM ใหญ่": list(rounds)})
+
+
+def test_pm_schedule_year_less_january_in_december_is_next_month():
+    schedule = build_pm_schedule(_pm("ม.ค.", "ธ.ค.", "พ.ย."), "v-dec", 2025, 12)
+    assert list(schedule["สถานะ"]) == [PM_BUCKETS[3][0], PM_BUCKETS[2][0], PM_BUCKETS[1][0]]
+
+
+def test_pm_schedule_year_less_december_in_january_is_overdue():
+    schedule = build_pm_schedule(_pm("ธ.ค.", "ม.ค.", "ก.พ."), "v-jan", 2026, 1)
+    assert list(schedule["สถานะ"]) == [PM_BUCKETS[1][0], PM_BUCKETS[2][0], PM_BUCKETS[3][0]]
+
+
+def test_pm_schedule_explicit_year_wins_over_nearest_month():
+    schedule = build_pm_schedule(_pm("ม.ค. 2568", "ม.ค. 69"), "v-year", 2025, 12)
+    assert list(schedule["สถานะ"]) == [PM_BUCKETS[1][0], PM_BUCKETS[3][0]]
+
+
+def test_pm_schedule_year_less_month_long_past_stays_overdue():
+    # ต.ค.: ม.ค./มี.ค. ที่ไม่ระบุปีคือรอบที่เลยมาแล้วในปีนี้ ไม่ใช่ของปีหน้า
+    schedule = build_pm_schedule(_pm("ม.ค.", "มี.ค.", "เม.ย.", "พ.ย.", "ธ.ค."), "v-oct", 2025, 10)
+    assert list(schedule["สถานะ"]) == [PM_BUCKETS[1][0]] * 3 + [PM_BUCKETS[3][0], PM_BUCKETS[4][0]]
+
+
+def test_pm_schedule_year_less_late_month_in_january_is_not_due():
+    # ม.ค.: มิ.ย./พ.ย. ที่ไม่ระบุปียังไม่ถึงรอบ (มีแค่ ธ.ค. ที่ถือเป็นเดือนที่แล้ว)
+    schedule = build_pm_schedule(_pm("มิ.ย.", "พ.ย."), "v-jan-late", 2026, 1)
+    assert list(schedule["สถานะ"]) == [PM_BUCKETS[4][0]] * 2
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from sensorapp.formulas import compile_formula, evaluate_table
+
+
+def test_x_means_multiply_only_between_operands():
+    formula = compile_formula("P", ["Vmax", "I"], "Vmax x I")
+    assert formula.error is None
+    assert formula.evaluate({"Vmax": 2.0, "I": 3.0}) == 6.0
+
+
+def test_round_with_constant_digits_works_on_a_whole_column():
+    formula = compile_formula("R", ["V"], "round(V / 3, 2)")
+    result = evaluate_table(formula, pd.DataFrame({"V": [4.0, 5.0]}))
+    assert np.allclose(result, [1.33, 1.67])
+
+
+def test_round_with_variable_digits_is_rejected():
+    formula = compile_formula("R", ["V", "n"], "round(V, n)")
+    assert formula.code is None
+    assert "round" in formula.error
@@ -0,0 +1,22 @@
+import socket
+
+from sensorapp.monitoring import start_metrics_server
+
+
+def test_port_in_use_is_skipped_instead_of_raising():
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        assert start_metrics_server(taken.getsockname()[1]) is None
+
+
+def test_binds_to_localhost_by_default():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = start_metrics_server(port)
+    try:
+        assert server.server_address == ("127.0.0.1", port)
+    finally:
+        server.shutdown()
+        server.server_close()
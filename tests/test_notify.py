@@ -0,0 +1,32 @@
+import threading
+
+from sensorapp import notify
+from sensorapp.notify import LineDispatcher
+
+
+class _Response:
+    status_code = 200
+    text = "{}"
+
+
+class _Session:
+    def __init__(self):
+        self.posts = 0
+
+    def post(self, *args, **kwargs):
+        self.posts += 1
+        return _Response()
+
+
+def test_stats_are_consistent_under_concurrent_submits(monkeypatch):
+    monkeypatch.setattr(notify, "LINE_DIGEST_WINDOW", 0.01)
+    monkeypatch.setattr(notify, "LINE_QUEUE_SIZE", 10_000)
+    dispatcher = LineDispatcher("token", "group", _Session())
+    threads = [threading.Thread(target=lambda: [dispatcher.submit("hi") for _ in range(500)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = dispatcher.stats()
+    assert stats["queued"] + stats.get("dropped", 0) == 4000
+    assert isinstance(stats, dict) and stats is not dispatcher.stats()
@@ -0,0 +1,155 @@
+import csv
+import io
+import time
+
+import pytest
+
+from sensorapp import data
+from sensorapp.data import GasOutbox, _parse_sheet_csv
+from sensorapp.metrics import Metrics
+
+HEADER = ["วันที่บันทึก", "ผู้เบิก/คืน", "อุปกรณ์", "ไซต์งาน", "สถานะ", "จำนวน"]
+ROW = ["2026-01-05 09:00:00", "Film", "Drill", "Site A", "ยืม", 2]
+
+
+class _Response:
+    def __init__(self, status, row=None):
+        self._status = status
+        self._row = row
+        self.text = status
+
+    def json(self):
+        return {"status": self._status} if self._row is None else {"status": self._status, "row": self._row}
+
+
+def _sheet(*rows, sheet="Team_Tools", header=HEADER):
+    """CSV แบบที่ gviz ส่งมา (ทุกช่องเป็นข้อความในเครื่องหมายคำพูด) -> DataFrame ผ่าน schema จริง"""
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows([header] + [[str(v) for v in row] for row in rows])
+    return _parse_sheet_csv(sheet, buffer.getvalue().encode())
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.time() + timeout
+    while not predicate():
+        assert time.time() < deadline
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    def make(status="success", row=None, on_delivered=None):
+        return GasOutbox(str(tmp_path / "outbox.sqlite3"), lambda payload: _Response(status, row),
+                         on_flushed=lambda sheet: None, metrics=Metrics(), on_delivered=on_delivered)
+    return make
+
+
+def test_sent_write_stays_overlaid_until_the_row_shows_up(outbox):
+    box = outbox()
+    box.enqueue({"action": "append_rows", "sheet": "Team_Tools", "rows": [ROW]}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent"))
+
+    box.confirm("Team_Tools", _sheet())  # gviz ยังไม่อัปเดต
+    assert box.pending_count() == 1
+    box.confirm("Team_Tools", _sheet(ROW))
+    assert box.pending_count() == 0
+    assert box.stats()[0] == {"confirmed": 1}
+
+
+def test_row_number_from_gas_confirms_regardless_of_formatting(outbox):
+    box = outbox(row=3)  # GAS: เขียนลงแถว 3 (หัวคอลัมน์ + 2 แถวข้อมูล)
+    box.enqueue({"action": "append_rows", "sheet": "Team_Tools", "rows": [ROW]}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent"))
+
+    other = ["2026-01-04 08:00:00", "Mink", "Meter", "Site B", "ยืม", 1]
+    box.confirm("Team_Tools", _sheet(other))
+    assert box.pending_count() == 1
+    box.confirm("Team_Tools", _sheet(other, ["5/1/2026 9:00:00", "Film", "Drill", "Site A", "ยืม", "2.00"]))
+    assert box.stats()[0] == {"confirmed": 1}
+
+
+def test_row_reformatted_by_sheets_still_matches_without_row_number(outbox):
+    box = outbox()
+    box.enqueue({"action": "append_rows", "sheet": "Team_Tools", "rows": [ROW]}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent"))
+
+    # Google จัดรูปแบบวันที่/ตัวเลขใหม่ และตัดช่องว่างหัวท้าย
+    box.confirm("Team_Tools", _sheet(["5/1/2026, 9:00:00", " Film ", "Drill", "Site  A", "ยืม", "2.0"]))
+    assert box.stats()[0] == {"confirmed": 1}
+
+
+def test_superseded_pm_status_is_confirmed_not_lost(outbox, monkeypatch):
+    monkeypatch.setattr(data, "OUTBOX_CONFIRM_TIMEOUT", 0)
+    box = outbox()
+    for status in ("PM แล้ว", ""):
+        box.enqueue({"action": "update_pm_status", "sheet": "PM_Plan", "siteName": "Site A", "status": status}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent") == 2)
+
+    box.confirm("PM_Plan", _sheet(["Site A", ""], sheet="PM_Plan", header=["ชื่อไซต์งาน", "สถานะ PM"]))
+    assert box.stats()[0] == {"confirmed": 2}
+    assert box.failures("Film") == []
+
+
+def test_identical_writes_each_need_their_own_row(outbox):
+    box = outbox()
+    for _ in range(2):
+        box.enqueue({"action": "append_rows", "sheet": "Team_Tools", "rows": [ROW]}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent") == 2)
+
+    box.confirm("Team_Tools", _sheet(ROW))
+    assert box.pending_count() == 1
+
+
+def test_write_never_seen_in_sheet_is_reported_to_its_owner(outbox, monkeypatch):
+    box = outbox()
+    monkeypatch.setattr(data, "OUTBOX_CONFIRM_TIMEOUT", 0)
+    box.enqueue({"action": "append_rows", "sheet": "Team_Tools", "rows": [ROW]}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent"))
+
+    box.confirm("Team_Tools", _sheet())
+    assert box.pending_count() == 0
+    failures = box.failures("Film")
+    assert [f.sheet for f in failures] == ["Team_Tools"]
+    assert "Drill" in failures[0].summary
+    assert box.failures("Mink") == []
+
+    box.acknowledge(failures[0].request_id)
+    assert box.failures("Film") == []
+
+
+def test_write_that_gives_up_is_reported_to_its_owner(outbox, monkeypatch):
+    monkeypatch.setattr(data, "OUTBOX_MAX_ATTEMPTS", 1)
+    box = outbox(status="error")
+    box.enqueue({"action": "update_pm_status", "sheet": "PM_Plan", "siteName": "Site A", "status": "PM แล้ว"}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("failed"))
+
+    assert box.pending_count() == 0
+    assert [f.summary for f in box.failures("Film")] == ["สถานะ PM ของ Site A -> PM แล้ว"]
+
+
+def test_notification_goes_out_only_after_gas_accepts_the_write(outbox, monkeypatch):
+    monkeypatch.setattr(data, "OUTBOX_MAX_ATTEMPTS", 1)
+    delivered = []
+    failing = outbox(status="error", on_delivered=delivered.append)
+    failing.enqueue({"sheet": "Task & Workload", "data": ["x"]}, owner="Film", notify="งานใหม่ A")
+    _wait_for(lambda: failing.stats()[0].get("failed"))
+    assert delivered == []
+
+    ok = outbox(on_delivered=delivered.append)
+    ok.enqueue({"sheet": "Task & Workload", "data": ["y"]}, owner="Film", notify="งานใหม่ B")
+    _wait_for(lambda: ok.stats()[0].get("sent"))
+    assert delivered == ["งานใหม่ B"]
+
+
+def test_task_rows_match_whatever_header_the_timestamp_column_has(outbox):
+    header = ["ประทับเวลา", "ชื่อไซต์งาน", "ชื่องาน / รายละเอียด", "ประเภทงาน", "วันที่เข้าทำ (Scheduled Date)",
+              "กำหนดเสร็จ (Deadline)", "สถานะงาน", "ผู้รับผิดชอบหลัก", "ผู้ช่วย"]
+    task = ["2026-01-05 09:00:00", "Site A", "เปลี่ยนซิม", "งานด่วน", "05/01/2026", "06/01/2026", "Planning", "Film", ""]
+    df = _sheet(sheet="Task & Workload", header=header)
+    assert df.columns[0] == "Timestamp"  # ใช้เรียง "งานล่าสุดขึ้นก่อน" ในหน้า Team Manager
+
+    box = outbox()
+    box.enqueue({"sheet": "Task & Workload", "data": task}, owner="Film")
+    _wait_for(lambda: box.stats()[0].get("sent"))
+    box.confirm("Task & Workload", _sheet(["5/1/2026, 9:00:00"] + task[1:], sheet="Task & Workload", header=header))
+    assert box.stats()[0] == {"confirmed": 1}
@@ -0,0 +1,46 @@
+import csv
+import io
+
+from loadtest.stub_server import run_query
+from sensorapp.data import ON_DEMAND_SHEETS, SheetFetcher, SheetHub, SheetQuery, _parse_sheet_csv
+from sensorapp.metrics import Metrics
+
+ASSETS = [
+    ["ไซต์ติดตั้ง (Site)", "Sensor", "Serial"],
+    ["Site A", "Temp", "SN1"],
+    ["Site B", "Flow", "SN2"],
+    ["Site A", "Humidity", "SN3"],
+]
+
+
+def _hub(downloads):
+    def download(sheet_name, query=None):
+        downloads.append(query)
+        buffer = io.StringIO()
+        csv.writer(buffer, quoting=csv.QUOTE_ALL).writerows(run_query(ASSETS, query))
+        return buffer.getvalue().encode()
+    return SheetHub(SheetFetcher(), download, _parse_sheet_csv, {"Asset_Sensor": 300},
+                    metrics=Metrics(), on_demand=ON_DEMAND_SHEETS)
+
+
+def test_site_filter_is_pushed_down_when_the_sheet_is_not_held():
+    downloads = []
+    hub = _hub(downloads)
+    assert hub.due_sheets() == []  # ชีต on-demand ไม่ถูกโหลดทั้งแผ่นตอนเปิดแอป
+
+    view = hub.query("Asset_Sensor", SheetQuery(filters=(("ชื่อไซต์งาน", "==", "Site A"),)))
+    assert view.df["Serial"].tolist() == ["SN1", "SN3"]
+    assert downloads == ["select * limit 0", "select A, B, C where A = 'Site A'"]
+
+    hub.query("Asset_Sensor", SheetQuery(filters=(("ชื่อไซต์งาน", "==", "Site A"),)))
+    assert len(downloads) == 2  # ซ้ำภายในรอบรีเฟรชใช้ของเดิม
+
+
+def test_held_snapshot_is_filtered_locally():
+    downloads = []
+    hub = _hub(downloads)
+    hub.get("Asset_Sensor")
+
+    view = hub.query("Asset_Sensor", SheetQuery(columns=("Serial",), filters=(("ชื่อไซต์งาน", "==", "Site B"),)))
+    assert view.df.to_dict("list") == {"Serial": ["SN2"]}
+    assert downloads == [None]